@@ -4,20 +4,161 @@ Binance API client for data collection.
 Fetches OHLCV data and market information from Binance.
 """
 
-import ccxt
+import asyncio
+import json
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, TYPE_CHECKING
+import threading
 import time
 
 from utils.logger import get_data_logger
 from utils.config import get_config
+from data_collection.rate_limiter import TokenBucket
+
+# ccxt, aiohttp and pyarrow are imported where first needed so that
+# importing this module stays cheap
+if TYPE_CHECKING:
+    import ccxt
+    import ccxt.async_support as ccxt_async
 
 logger = get_data_logger()
 
+# Upper bound on in-flight requests for the async fetch paths
+MAX_CONCURRENT_REQUESTS = 8
+
+# Seconds before the cached market list is reloaded
+MARKETS_TTL = 3600
+
+# Connection pool settings for the shared aiohttp session
+CONNECTOR_LIMIT = 16
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 75
+
+# Request weight of the /api/v3/klines endpoint
+KLINES_WEIGHT = 2
+
+# Request weights of the other endpoints the client calls: /api/v3/exchangeInfo
+# (load_markets), /api/v3/ticker/24hr for one symbol and /api/v3/time
+EXCHANGE_INFO_WEIGHT = 20
+TICKER_WEIGHT = 2
+TIME_WEIGHT = 1
+
+# Burst size of the request weight bucket
+RATE_LIMIT_BURST = 50
+
+# Binance market data websocket endpoint
+WS_STREAM_URL = 'wss://stream.binance.com:9443/ws'
+
+# Upper bound on the reconnect delay of streaming feeds (seconds)
+MAX_RECONNECT_DELAY = 60
+
+# Largest number of candles one klines request returns
+KLINES_PAGE_LIMIT = 1000
+
+# Minutes per unit of the fixed-length timeframes (month candles vary in
+# length, so they are never resampled)
+TIMEFRAME_UNIT_MINUTES = {'m': 1, 'h': 60, 'd': 1440, 'w': 10080}
+
+# Binance weekly candles open on Monday; every other fixed timeframe is
+# aligned to the Unix epoch
+WEEK_ORIGIN = pd.Timestamp('1970-01-05')
+
+# How finer candles combine into a coarser one
+OHLCV_AGGREGATION = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum'
+}
+
+
+def _get_header(headers: Optional[Dict[str, Any]], name: str) -> Optional[str]:
+    """
+    Case-insensitive response header lookup.
+    
+    The async CCXT client stores headers in a plain dict, so the casing
+    depends on what the server sent.
+    
+    Args:
+        headers: Response headers (may be None)
+        name: Header name
+        
+    Returns:
+        Header value or None if absent
+    """
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _timeframe_minutes(timeframe: str) -> Optional[int]:
+    """
+    Length of a fixed-length timeframe in minutes.
+    
+    Args:
+        timeframe: Timeframe (e.g., '15m', '4h', '1w')
+        
+    Returns:
+        Number of minutes, or None for month candles and unknown codes
+    """
+    unit = TIMEFRAME_UNIT_MINUTES.get(timeframe[-1:])
+    count = timeframe[:-1]
+    if unit is None or not count.isdigit():
+        return None
+    return int(count) * unit
+
+
+def resample_ohlcv(df: pd.DataFrame, minutes: int, base_minutes: int) -> pd.DataFrame:
+    """
+    Aggregate OHLCV candles into a coarser timeframe.
+    
+    Bins are aligned the way Binance aligns its own candles. The leading
+    bin is dropped when the input starts partway through it, since its
+    open and volume would be wrong; the trailing bin is kept as the
+    still-forming candle, like the exchange returns it.
+    
+    Args:
+        df: OHLCV DataFrame indexed by candle open time
+        minutes: Target timeframe length in minutes
+        base_minutes: Timeframe length of df in minutes
+        
+    Returns:
+        Resampled OHLCV DataFrame
+    """
+    origin = WEEK_ORIGIN if minutes % TIMEFRAME_UNIT_MINUTES['w'] == 0 else 'epoch'
+    bins = df.resample(f'{minutes}min', origin=origin, closed='left', label='left')
+    
+    result = bins.agg(OHLCV_AGGREGATION)
+    counts = bins.size().to_numpy()
+    
+    keep = counts > 0
+    if len(keep) and counts[0] < minutes // base_minutes:
+        keep[0] = False
+    
+    result = result[keep]
+    result.index = pd.DatetimeIndex(
+        result.index.as_unit(df.index.unit),
+        name=df.index.name
+    )
+    return result
+
 
 class BinanceClient:
-    """Binance API client for fetching cryptocurrency data."""
+    """
+    Binance API client for fetching cryptocurrency data.
+    
+    Concurrent fetches run on an async CCXT exchange that shares one
+    aiohttp session (and connection pool) for the lifetime of the client.
+    Call close() when done, or use the client as an async context manager.
+    """
     
     def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None):
         """
@@ -35,17 +176,196 @@ class BinanceClient:
             api_key = api_key or keys.get('api_key')
             api_secret = api_secret or keys.get('api_secret')
         
+        self._api_key = api_key
+        self._api_secret = api_secret
+        
         # Initialize CCXT Binance client
-        self.exchange = ccxt.binance({
-            'apiKey': api_key,
-            'secret': api_secret,
-            'enableRateLimit': True,  # Respect rate limits
+        import ccxt
+        self.exchange = ccxt.binance(self._exchange_params())
+        self._rate_limit_errors = (ccxt.RateLimitExceeded, ccxt.DDoSProtection)
+        
+        # Request weight budget shared by the sync and async paths
+        params = self.config.get_data_collection_params()
+        rate_limits = params.get('rate_limits', {})
+        retry = params.get('retry', {})
+        self.rate_limiter = TokenBucket(
+            rate_per_min=rate_limits.get('weight_per_minute', 1200),
+            burst=RATE_LIMIT_BURST
+        )
+        self._max_attempts = retry.get('max_attempts', 3)
+        self._backoff_factor = retry.get('backoff_factor', 2)
+        
+        # On-disk store of closed candles (see _cache_prefix)
+        storage = params.get('storage', {})
+        self.cache = None
+        if storage.get('cache_enabled', True):
+            from data_collection.ohlcv_cache import OHLCVCache
+            self.cache = OHLCVCache(
+                root=storage.get('cache_dir', 'data/raw/ohlcv'),
+                compression=storage.get('compression', 'snappy')
+            )
+        
+        # Async exchange, its HTTP session and the loop they are bound to;
+        # created lazily on the first concurrent fetch. The loop runs on a
+        # background thread so the blocking API works from any thread and
+        # from inside a running event loop
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self._session = None
+        self._async_exchange = None
+        
+        # Market metadata cache (see get_market_info)
+        self._markets = None
+        self._markets_ts = 0.0
+        self._missing_symbols = set()
+        
+        logger.info("✅ Binance client initialized")
+    
+    def _exchange_params(self) -> Dict[str, Any]:
+        """
+        Build CCXT exchange parameters.
+        
+        Returns:
+            Parameters shared by the sync and async exchange instances
+        """
+        return {
+            'apiKey': self._api_key,
+            'secret': self._api_secret,
+            'enableRateLimit': False,  # Throttled by self.rate_limiter instead
             'options': {
                 'defaultType': 'spot',  # Use spot market
             }
-        })
+        }
+    
+    def _retry_delay(self, exchange: 'ccxt.Exchange', attempt: int) -> float:
+        """
+        Compute how long to back off after a rate limit error.
         
-        logger.info("✅ Binance client initialized")
+        Args:
+            exchange: Exchange that received the error
+            attempt: Zero-based attempt number
+            
+        Returns:
+            Delay in seconds (Retry-After if given, else exponential backoff)
+        """
+        delay = float(self._backoff_factor ** attempt)
+        retry_after = _get_header(exchange.last_response_headers, 'Retry-After')
+        if retry_after is not None:
+            delay = max(delay, float(retry_after))
+        return delay
+    
+    def _record_weight(self, exchange: 'ccxt.Exchange'):
+        """
+        Feed the weight reported by Binance back into the rate limiter.
+        
+        Args:
+            exchange: Exchange that issued the last request
+        """
+        used_weight = _get_header(exchange.last_response_headers, 'X-MBX-USED-WEIGHT-1M')
+        if used_weight is not None:
+            self.rate_limiter.update_used_weight(float(used_weight))
+    
+    @staticmethod
+    def _to_array(ohlcv: List[List[float]]) -> np.ndarray:
+        """
+        Convert raw CCXT OHLCV rows to a float64 array.
+        
+        Args:
+            ohlcv: List of [timestamp, open, high, low, close, volume] rows
+            
+        Returns:
+            Array of shape (n, 6) in the same column order
+        """
+        return np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+    
+    @staticmethod
+    def _to_dataframe(arr: np.ndarray) -> pd.DataFrame:
+        """
+        Convert an (n, 6) OHLCV array to a DataFrame.
+        
+        Price and volume columns are stored as float32, which is ample
+        precision for indicator math and halves the memory every
+        downstream pass has to read.
+        
+        Args:
+            arr: Array of [timestamp, open, high, low, close, volume] rows
+            
+        Returns:
+            DataFrame with float32 OHLCV data indexed by timestamp
+        """
+        index = pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms')
+        
+        # Downcast and lay out column-major in one step, then hand the block
+        # to pandas as is
+        values = np.ascontiguousarray(arr[:, 1:].T, dtype=np.float32)
+        return pd.DataFrame(
+            values.T,
+            columns=['open', 'high', 'low', 'close', 'volume'],
+            index=pd.DatetimeIndex(index, name='timestamp'),
+            copy=False
+        )
+    
+    def _cache_prefix(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        since: Optional[int]
+    ) -> Tuple[np.ndarray, Optional[int], int]:
+        """
+        Look up cached candles that can answer the start of a request.
+        
+        Only a gap-free run beginning with the first candle at or after
+        since is used; anything after it is left to the exchange.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            limit: Number of candles requested
+            since: Timestamp in milliseconds (cache is skipped if None)
+            
+        Returns:
+            Tuple of (cached rows, since for the remaining request, remaining limit)
+        """
+        if self.cache is None or since is None:
+            return np.empty((0, 6)), since, limit
+        
+        tf_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        cached = self.cache.load(symbol, timeframe, since, since + limit * tf_ms)
+        
+        if not len(cached) or cached[0, 0] >= since + tf_ms:
+            return np.empty((0, 6)), since, limit
+        
+        gaps = np.flatnonzero(np.diff(cached[:, 0]) != tf_ms)
+        if len(gaps):
+            cached = cached[:gaps[0] + 1]
+        cached = cached[:limit]
+        
+        return cached, int(cached[-1, 0]) + tf_ms, limit - len(cached)
+    
+    def _cache_store(self, symbol: str, timeframe: str, fetched: np.ndarray):
+        """
+        Store the closed candles of a since-based backfill.
+        
+        Live requests (since=None) never read the cache, so only backfills
+        are worth writing back.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            fetched: Rows returned by the exchange
+        """
+        if self.cache is None or not len(fetched):
+            return
+        
+        # The last candle may still be open; only closed ones are final
+        tf_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        closed = fetched[fetched[:, 0] + tf_ms <= time.time() * 1000]
+        try:
+            self.cache.store(symbol, timeframe, closed)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not cache {symbol} {timeframe}: {e}")
     
     def fetch_ohlcv(
         self,
@@ -64,39 +384,264 @@ class BinanceClient:
             since: Timestamp in milliseconds (optional)
             
         Returns:
-            DataFrame with OHLCV data
+            DataFrame with float32 OHLCV data
+        """
+        # Convert to DataFrame
+        return self._to_dataframe(
+            self._fetch_ohlcv_raw(symbol, timeframe, limit, since)
+        )
+    
+    def _fetch_ohlcv_raw(
+        self,
+        symbol: str,
+        timeframe: str = '1h',
+        limit: int = 500,
+        since: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Fetch OHLCV data without building a DataFrame.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe (e.g., '1m', '5m', '15m', '1h', '4h', '1d')
+            limit: Number of candles to fetch (max 1000)
+            since: Timestamp in milliseconds (optional)
+            
+        Returns:
+            Array of shape (n, 6): timestamp, open, high, low, close, volume
         """
         try:
-            logger.info(f"📊 Fetching {symbol} {timeframe} data (limit={limit})")
+            cached, since, limit = self._cache_prefix(symbol, timeframe, limit, since)
             
-            # Fetch data from Binance
-            ohlcv = self.exchange.fetch_ohlcv(
-                symbol=symbol,
-                timeframe=timeframe,
-                limit=limit,
-                since=since
-            )
+            if limit > 0:
+                logger.info(f"📊 Fetching {symbol} {timeframe} data (limit={limit})")
+                
+                # Fetch data from Binance, backing off on rate limit errors
+                for attempt in range(self._max_attempts):
+                    self.rate_limiter.acquire(KLINES_WEIGHT)
+                    try:
+                        ohlcv = self.exchange.fetch_ohlcv(
+                            symbol=symbol,
+                            timeframe=timeframe,
+                            limit=limit,
+                            since=since
+                        )
+                        break
+                    except self._rate_limit_errors:
+                        if attempt == self._max_attempts - 1:
+                            raise
+                        delay = self._retry_delay(self.exchange, attempt)
+                        logger.warning(f"⚠️  Rate limited on {symbol}, retrying in {delay:.1f}s")
+                        time.sleep(delay)
+                
+                self._record_weight(self.exchange)
+                
+                arr = self._to_array(ohlcv)
+                if since is not None:
+                    self._cache_store(symbol, timeframe, arr)
+                if len(cached):
+                    arr = np.concatenate([cached, arr])
+            else:
+                arr = cached
+            
+            logger.info(f"✅ Fetched {len(arr)} candles for {symbol} {timeframe}")
+            return arr
+            
+        except Exception as e:
+            logger.error(f"❌ Error fetching {symbol} {timeframe}: {str(e)}")
+            raise
+    
+    async def _afetch_ohlcv(
+        self,
+        exchange: 'ccxt_async.Exchange',
+        symbol: str,
+        timeframe: str = '1h',
+        limit: int = 500,
+        since: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Async counterpart of _fetch_ohlcv_raw.
+        
+        Args:
+            exchange: Async CCXT exchange to issue the request on
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe (e.g., '1m', '5m', '15m', '1h', '4h', '1d')
+            limit: Number of candles to fetch (max 1000)
+            since: Timestamp in milliseconds (optional)
             
-            # Convert to DataFrame
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        Returns:
+            Array of shape (n, 6): timestamp, open, high, low, close, volume
+        """
+        # Parquet reads and writes block, so they run off the event loop
+        loop = asyncio.get_running_loop()
+        cached = np.empty((0, 6))
+        if since is not None:
+            cached, since, limit = await loop.run_in_executor(
+                None, self._cache_prefix, symbol, timeframe, limit, since
             )
+        
+        if limit <= 0:
+            return cached
+        
+        logger.info(f"📊 Fetching {symbol} {timeframe} data (limit={limit})")
+        
+        for attempt in range(self._max_attempts):
+            await self.rate_limiter.acquire_async(KLINES_WEIGHT)
+            try:
+                ohlcv = await exchange.fetch_ohlcv(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    limit=limit,
+                    since=since
+                )
+                break
+            except self._rate_limit_errors:
+                if attempt == self._max_attempts - 1:
+                    raise
+                delay = self._retry_delay(exchange, attempt)
+                logger.warning(f"⚠️  Rate limited on {symbol}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        
+        self._record_weight(exchange)
+        
+        arr = self._to_array(ohlcv)
+        if since is not None:
+            await loop.run_in_executor(None, self._cache_store, symbol, timeframe, arr)
+        if len(cached):
+            arr = np.concatenate([cached, arr])
+        
+        logger.info(f"✅ Fetched {len(arr)} candles for {symbol} {timeframe}")
+        return arr
+    
+    async def _get_async_exchange(self) -> 'ccxt_async.Exchange':
+        """
+        Get the shared async exchange, creating it on first use.
+        
+        Returns:
+            Async CCXT exchange backed by a persistent aiohttp session
+        """
+        if self._async_exchange is None:
+            import aiohttp
+            import ccxt.async_support as ccxt_async
             
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTOR_LIMIT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._async_exchange = ccxt_async.binance({
+                **self._exchange_params(),
+                'session': self._session
+            })
+        return self._async_exchange
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the client's event loop, starting its thread on first use.
+        
+        Returns:
+            Event loop running on the client's background thread
+        """
+        with self._loop_lock:
+            if self._loop_thread is None or not self._loop_thread.is_alive():
+                if self._loop is not None:
+                    # The old loop's thread is gone (e.g. in a forked child),
+                    # so the session bound to it cannot be used any more
+                    self._session = None
+                    self._async_exchange = None
+                
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='binance-client-loop',
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+    
+    def _run(self, coro):
+        """
+        Run a coroutine on the client's event loop and wait for its result.
+        
+        Safe to call from several threads at once and from inside a running
+        event loop (which blocks until the result arrives, as with any other
+        blocking call). The loop persists between calls so the shared
+        session stays open.
+        
+        Args:
+            coro: Coroutine to run
             
-            # Convert to float
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
+        Returns:
+            Result of the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+    
+    async def _afetch_many(
+        self,
+        requests: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Run several OHLCV requests concurrently.
+        
+        Concurrency is bounded by MAX_CONCURRENT_REQUESTS and every call
+        draws from the shared rate limiter.
+        
+        Args:
+            requests: Keyword arguments for each _afetch_ohlcv call
             
-            logger.info(f"✅ Fetched {len(df)} candles for {symbol} {timeframe}")
-            return df
+        Returns:
+            List of (n, 6) OHLCV arrays or exceptions, in request order
+        """
+        exchange = await self._get_async_exchange()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        async def fetch(kwargs: Dict[str, Any]) -> np.ndarray:
+            async with semaphore:
+                return await self._afetch_ohlcv(exchange, **kwargs)
+        
+        return await asyncio.gather(
+            *(fetch(kwargs) for kwargs in requests),
+            return_exceptions=True
+        )
+    
+    async def _close_exchange(self):
+        """Close the async exchange and its shared HTTP session (on the client loop)."""
+        if self._async_exchange is not None:
+            await self._async_exchange.close()
+            self._async_exchange = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def close(self):
+        """Release network resources held by the client."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = None
+            self._loop_thread = None
             
-        except Exception as e:
-            logger.error(f"❌ Error fetching {symbol} {timeframe}: {str(e)}")
-            raise
+            if thread is not None and thread.is_alive():
+                asyncio.run_coroutine_threadsafe(self._close_exchange(), loop).result()
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+            if loop is not None:
+                loop.close()
+    
+    async def aclose(self):
+        """
+        Release network resources without blocking the caller's event loop.
+        
+        The session was opened on the client's loop thread, so it is closed
+        there by close() rather than from the caller's loop.
+        """
+        await asyncio.to_thread(self.close)
+    
+    async def __aenter__(self) -> 'BinanceClient':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
     
     def fetch_historical_data(
         self,
@@ -121,39 +666,48 @@ class BinanceClient:
             # Calculate since timestamp
             since = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
             
-            all_data = []
-            current_since = since
+            # The first batch tells us where the data actually starts
+            first = self._fetch_ohlcv_raw(
+                symbol=symbol,
+                timeframe=timeframe,
+                limit=1000,
+                since=since
+            )
+            
+            batches = []
             
-            while True:
-                # Fetch batch
-                df = self.fetch_ohlcv(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    limit=1000,
-                    since=current_since
-                )
-                
-                if df.empty:
-                    break
-                
-                all_data.append(df)
+            if len(first):
+                batches.append(first)
                 
-                # Check if we have enough data
-                last_timestamp = df.index[-1]
-                if last_timestamp >= datetime.now() - timedelta(hours=1):
-                    break
-                
-                # Update since for next batch
-                current_since = int(last_timestamp.timestamp() * 1000) + 1
-                
-                # Rate limiting
-                time.sleep(0.5)
+                # Remaining pages have known offsets, so fetch them concurrently
+                last_ms = int(first[-1, 0])
+                now_ms = int(time.time() * 1000)
+                if last_ms < now_ms - 3600 * 1000:
+                    page_ms = self.exchange.parse_timeframe(timeframe) * 1000 * 1000
+                    start = last_ms + 1
+                    
+                    pages = self._run(self._afetch_many([
+                        {'symbol': symbol, 'timeframe': timeframe, 'limit': 1000, 'since': page_since}
+                        for page_since in range(start, now_ms, page_ms)
+                    ]))
+                    
+                    for page in pages:
+                        if isinstance(page, Exception):
+                            raise page
+                        if len(page):
+                            batches.append(page)
             
-            # Combine all data
-            if all_data:
-                result = pd.concat(all_data)
-                result = result[~result.index.duplicated(keep='first')]
-                result = result.sort_index()
+            # Combine all data into a single preallocated buffer
+            if batches:
+                buf = np.empty((sum(len(b) for b in batches), 6), dtype=np.float64)
+                ofs = 0
+                for batch in batches:
+                    buf[ofs:ofs + len(batch)] = batch
+                    ofs += len(batch)
+                
+                # Drop duplicate timestamps (keeping the first) and sort
+                _, first_idx = np.unique(buf[:, 0], return_index=True)
+                result = self._to_dataframe(buf[first_idx])
                 
                 logger.info(f"✅ Fetched {len(result)} total candles for {symbol}")
                 return result
@@ -186,25 +740,152 @@ class BinanceClient:
         
         logger.info(f"🔄 Fetching data for {len(symbols)} symbols")
         
-        for symbol in symbols:
-            try:
-                df = self.fetch_ohlcv(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    limit=limit
-                )
-                results[symbol] = df
-                
-                # Rate limiting
-                time.sleep(0.2)
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to fetch {symbol}: {str(e)}")
+        frames = self._run(self._afetch_many([
+            {'symbol': symbol, 'timeframe': timeframe, 'limit': limit}
+            for symbol in symbols
+        ]))
+        
+        for symbol, arr in zip(symbols, frames):
+            if isinstance(arr, Exception):
+                logger.error(f"❌ Failed to fetch {symbol}: {str(arr)}")
                 results[symbol] = pd.DataFrame()
+            else:
+                results[symbol] = self._to_dataframe(arr)
         
         logger.info(f"✅ Completed fetching {len(results)} symbols")
         return results
     
+    async def stream_klines(
+        self,
+        symbol: str,
+        timeframe: str = '1h'
+    ) -> AsyncIterator[np.ndarray]:
+        """
+        Stream closed candles from the Binance kline websocket.
+        
+        Candles are pushed by the exchange as they close, so live consumers
+        need no polling and use no request weight. Dropped connections are
+        re-established with exponential backoff.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe (e.g., '1m', '5m', '15m', '1h', '4h', '1d')
+            
+        Yields:
+            Array of shape (6,): timestamp, open, high, low, close, volume
+        """
+        import aiohttp
+        
+        url = f"{WS_STREAM_URL}/{symbol.replace('/', '').lower()}@kline_{timeframe}"
+        attempt = 0
+        
+        # The shared session belongs to the client's loop thread, so the
+        # stream gets its own session on the caller's loop
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    async with session.ws_connect(url) as ws:
+                        logger.info(f"📡 Streaming {symbol} {timeframe} candles")
+                        attempt = 0
+                        
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.ERROR:
+                                break
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                continue
+                            
+                            kline = json.loads(msg.data)['k']
+                            
+                            # Skip in-progress updates; only closed candles are final
+                            if not kline['x']:
+                                continue
+                            
+                            yield np.array([
+                                kline['t'], kline['o'], kline['h'],
+                                kline['l'], kline['c'], kline['v']
+                            ], dtype=np.float64)
+                            
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.warning(f"⚠️  Kline stream for {symbol} dropped: {str(e)}")
+                
+                delay = min(self._backoff_factor ** attempt, MAX_RECONNECT_DELAY)
+                attempt += 1
+                logger.info(f"🔄 Reconnecting {symbol} {timeframe} stream in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    def fetch_multiple_timeframes(
+        self,
+        symbol: str,
+        timeframes: List[str],
+        limit: int = 500
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch data for one symbol on several timeframes.
+        
+        Coarser timeframes whose candles fit in a single page of the finest
+        requested timeframe are resampled from it locally instead of being
+        requested separately; the rest are fetched concurrently.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframes: List of timeframes
+            limit: Number of candles per timeframe
+            
+        Returns:
+            Dictionary mapping timeframes to DataFrames
+        """
+        results = {}
+        
+        minutes = {tf: _timeframe_minutes(tf) for tf in timeframes}
+        fixed = [tf for tf in timeframes if minutes[tf]]
+        base = min(fixed, key=minutes.get) if fixed else None
+        
+        # One spare coarse candle covers a partial leading bin
+        derived = [
+            tf for tf in fixed
+            if minutes[tf] > minutes[base]
+            and minutes[tf] % minutes[base] == 0
+            and minutes[tf] // minutes[base] * (limit + 1) <= KLINES_PAGE_LIMIT
+        ]
+        fetched = [tf for tf in dict.fromkeys(timeframes) if tf not in derived]
+        base_limit = max(
+            [limit] + [minutes[tf] // minutes[base] * (limit + 1) for tf in derived]
+        )
+        
+        logger.info(
+            f"🔄 Fetching {symbol} on {len(timeframes)} timeframes "
+            f"({len(fetched)} requests)"
+        )
+        
+        frames = self._run(self._afetch_many([
+            {
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'limit': base_limit if timeframe == base else limit
+            }
+            for timeframe in fetched
+        ]))
+        
+        for timeframe, arr in zip(fetched, frames):
+            if isinstance(arr, Exception):
+                logger.error(f"❌ Failed to fetch {symbol} {timeframe}: {str(arr)}")
+                results[timeframe] = pd.DataFrame()
+            else:
+                results[timeframe] = self._to_dataframe(arr)
+        
+        if derived:
+            base_df = results[base]
+            for timeframe in derived:
+                if base_df.empty:
+                    results[timeframe] = pd.DataFrame()
+                else:
+                    results[timeframe] = resample_ohlcv(
+                        base_df, minutes[timeframe], minutes[base]
+                    ).iloc[-limit:]
+            results[base] = base_df.iloc[-limit:]
+        
+        return {timeframe: results[timeframe] for timeframe in timeframes}
+    
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         """
         Get current ticker information.
@@ -216,7 +897,9 @@ class BinanceClient:
             Ticker information dictionary
         """
         try:
+            self.rate_limiter.acquire(TICKER_WEIGHT)
             ticker = self.exchange.fetch_ticker(symbol)
+            self._record_weight(self.exchange)
             logger.debug(f"📈 Ticker for {symbol}: ${ticker['last']:.2f}")
             return ticker
         except Exception as e:
@@ -234,12 +917,23 @@ class BinanceClient:
             Market information dictionary
         """
         try:
-            markets = self.exchange.load_markets()
-            if symbol in markets:
-                return markets[symbol]
-            else:
+            # Markets are loaded once and reused until MARKETS_TTL expires
+            now = time.monotonic()
+            if self._markets is None or now - self._markets_ts > MARKETS_TTL:
+                self.rate_limiter.acquire(EXCHANGE_INFO_WEIGHT)
+                self._markets = self.exchange.load_markets(reload=True)
+                self._record_weight(self.exchange)
+                self._markets_ts = now
+                self._missing_symbols.clear()
+            
+            if symbol in self._markets:
+                return self._markets[symbol]
+            
+            # Only warn once per unknown symbol until the next reload
+            if symbol not in self._missing_symbols:
+                self._missing_symbols.add(symbol)
                 logger.warning(f"⚠️  Symbol {symbol} not found")
-                return {}
+            return {}
         except Exception as e:
             logger.error(f"❌ Error fetching market info: {str(e)}")
             raise
@@ -255,7 +949,9 @@ class BinanceClient:
             logger.info("🔌 Testing Binance connection...")
             
             # Fetch server time
+            self.rate_limiter.acquire(TIME_WEIGHT)
             time_response = self.exchange.fetch_time()
+            self._record_weight(self.exchange)
             server_time = datetime.fromtimestamp(time_response / 1000)
             
             logger.info(f"✅ Connected to Binance! Server time: {server_time}")
@@ -266,6 +962,24 @@ class BinanceClient:
             return False
 
 
+@lru_cache(maxsize=1)
+def get_client() -> BinanceClient:
+    """
+    Get the client shared by the whole process, creating it on first use.
+    
+    Sharing one client means one set of connection pools and one request
+    weight budget, however many scanners and generators use it. Several
+    threads may use it at once: batched fetches from all of them run on
+    the client's own event loop thread (see _run) and the rate limiter is
+    locked. close() only releases the network resources until the next
+    request.
+    
+    Returns:
+        BinanceClient instance
+    """
+    return BinanceClient()
+
+
 if __name__ == '__main__':
     """Test Binance client."""
     print("=" * 70)
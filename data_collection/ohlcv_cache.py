@@ -0,0 +1,160 @@
+"""
+On-disk OHLCV cache.
+
+Closed candles never change, so they are stored in parquet files and served
+from disk on later requests instead of going back to the exchange.
+
+Layout (hive partitioned, one file per month):
+    {root}/{BASE_QUOTE}/{timeframe}/year=YYYY/month=M/data.parquet
+"""
+
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+from utils.logger import get_data_logger
+
+logger = get_data_logger()
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+OHLCV_SCHEMA = pa.schema(
+    [('timestamp', pa.int64())] +
+    [(name, pa.float64()) for name in OHLCV_COLUMNS[1:]]
+)
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('year', pa.int16()), ('month', pa.int8())]),
+    flavor='hive'
+)
+
+
+class OHLCVCache:
+    """
+    Parquet-backed store of closed OHLCV candles.
+    
+    Rows are exchanged as (n, 6) float64 arrays in CCXT column order, the
+    same format BinanceClient uses internally.
+    """
+    
+    def __init__(self, root: str = 'data/raw/ohlcv', compression: str = 'snappy'):
+        """
+        Initialize the cache.
+        
+        Args:
+            root: Directory holding the cached candles
+            compression: Parquet compression codec
+        """
+        self.root = Path(root)
+        self.compression = compression
+        self._filesystem = pafs.LocalFileSystem(use_mmap=True)
+        self._lock = threading.Lock()
+    
+    def _path(self, symbol: str, timeframe: str) -> Path:
+        """Directory holding the candles of one symbol/timeframe."""
+        return self.root / symbol.replace('/', '_') / timeframe
+    
+    def load(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        until: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Load cached candles in [since, until).
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe (e.g., '1h')
+            since: First timestamp in milliseconds
+            until: End timestamp in milliseconds (open ended if None)
+        
+        Returns:
+            Array of shape (n, 6) sorted by timestamp
+        """
+        path = self._path(symbol, timeframe)
+        if not path.is_dir():
+            return np.empty((0, 6))
+        
+        condition = ds.field('timestamp') >= since
+        if until is not None:
+            condition &= ds.field('timestamp') < until
+        
+        dataset = ds.dataset(
+            str(path),
+            schema=OHLCV_SCHEMA,
+            format='parquet',
+            partitioning=PARTITIONING,
+            filesystem=self._filesystem
+        )
+        table = dataset.to_table(columns=OHLCV_COLUMNS, filter=condition)
+        
+        arr = np.column_stack([
+            table.column(name).to_numpy().astype(np.float64)
+            for name in OHLCV_COLUMNS
+        ]) if table.num_rows else np.empty((0, 6))
+        
+        return arr[np.argsort(arr[:, 0], kind='stable')]
+    
+    def store(self, symbol: str, timeframe: str, arr: np.ndarray):
+        """
+        Merge candles into the cache.
+        
+        Each affected month file is rewritten through a temporary file and
+        an atomic rename, so readers never see a partial write.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            arr: Array of shape (n, 6) holding closed candles only
+        """
+        if not len(arr):
+            return
+        
+        timestamps = arr[:, 0].astype(np.int64).astype('datetime64[ms]')
+        months = timestamps.astype('datetime64[M]')
+        
+        with self._lock:
+            for month in np.unique(months):
+                year, month_num = str(month).split('-')
+                part_dir = (
+                    self._path(symbol, timeframe) /
+                    f'year={int(year)}' / f'month={int(month_num)}'
+                )
+                part_dir.mkdir(parents=True, exist_ok=True)
+                target = part_dir / 'data.parquet'
+                
+                rows = arr[months == month]
+                if target.exists():
+                    existing = pq.read_table(target, schema=OHLCV_SCHEMA)
+                    rows = np.concatenate([
+                        np.column_stack([
+                            existing.column(name).to_numpy().astype(np.float64)
+                            for name in OHLCV_COLUMNS
+                        ]),
+                        rows
+                    ])
+                
+                # Keep the latest copy of any duplicated candle
+                _, last_idx = np.unique(rows[::-1, 0], return_index=True)
+                rows = rows[::-1][last_idx]
+                
+                table = pa.table(
+                    [rows[:, 0].astype(np.int64)] + [rows[:, i] for i in range(1, 6)],
+                    schema=OHLCV_SCHEMA
+                )
+                
+                tmp = part_dir / f'.{uuid.uuid4().hex}.tmp'
+                pq.write_table(table, tmp, compression=self.compression)
+                os.replace(tmp, target)
+        
+        logger.debug(f"💾 Cached {len(arr)} candles for {symbol} {timeframe}")
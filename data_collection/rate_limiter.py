@@ -0,0 +1,93 @@
+"""
+Rate limiting for exchange API calls.
+
+Implements a token bucket sized to Binance's per-minute request weight
+budget. The bucket is refilled continuously and corrected with the weight
+the exchange reports back in its response headers.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    
+    Tokens represent request weight. Acquiring more tokens than available
+    reserves them in advance and waits until the bucket has refilled, so
+    concurrent callers are spaced out instead of bursting together.
+    Safe to share between threads and async tasks.
+    """
+    
+    def __init__(self, rate_per_min: float = 1000, burst: int = 50):
+        """
+        Initialize token bucket.
+        
+        Args:
+            rate_per_min: Sustained weight allowed per minute
+            burst: Maximum weight that can be spent at once
+        """
+        self.rate_per_min = rate_per_min
+        self.rate = rate_per_min / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self, weight: float) -> float:
+        """
+        Take tokens from the bucket.
+        
+        Args:
+            weight: Request weight to reserve
+            
+        Returns:
+            Seconds to wait before the request may be sent
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= weight
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+    
+    def acquire(self, weight: float = 1):
+        """
+        Block until the given weight may be spent.
+        
+        Args:
+            weight: Request weight
+        """
+        wait = self._reserve(weight)
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self, weight: float = 1):
+        """
+        Wait (without blocking the event loop) until the given weight may be spent.
+        
+        Args:
+            weight: Request weight
+        """
+        wait = self._reserve(weight)
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def update_used_weight(self, used_weight: Optional[float]):
+        """
+        Correct the bucket with the weight reported by the exchange.
+        
+        Binance returns the weight used in the current minute in the
+        X-MBX-USED-WEIGHT-1M header; the bucket never holds more tokens
+        than the budget left in that window.
+        
+        Args:
+            used_weight: Weight used in the current minute (ignored if None)
+        """
+        if used_weight is None:
+            return
+        with self._lock:
+            self.tokens = min(self.tokens, self.rate_per_min - float(used_weight))
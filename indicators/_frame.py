@@ -0,0 +1,88 @@
+"""
+DataFrame helpers shared by the indicator modules.
+"""
+
+import pandas as pd
+
+
+def _with_columns(df: pd.DataFrame, **columns) -> pd.DataFrame:
+    """
+    Return a new DataFrame with columns added, like df.assign(**columns).
+    
+    assign inserts the columns one at a time and every insert pays pandas'
+    per-column bookkeeping, which dominates on scanner-sized frames. Here
+    the new columns are built as one frame and attached with a single
+    concat (no data is copied). df.attrs is carried over.
+    
+    Args:
+        df: Input DataFrame (left untouched)
+        **columns: Column name to array or index-aligned Series
+    
+    Returns:
+        DataFrame with the new columns appended
+    """
+    # Replacing a column keeps its position, which only assign does
+    if not columns.keys().isdisjoint(df.columns):
+        return df.assign(**columns)
+    
+    out = pd.concat([df, pd.DataFrame(columns, index=df.index, copy=False)], axis=1)
+    out.attrs = df.attrs
+    return out
+
+
+class _FullPrecision:
+    """
+    Float64 values behind columns stored in INDICATOR_DTYPE.
+    
+    Kept in df.attrs so later steps can reuse them instead of recomputing
+    or reading the narrowed columns. pandas deep-copies attrs on most
+    operations and compares them on concat; this holder is shared rather
+    than copied and compares by identity, so neither costs anything and
+    concatenated frames of different symbols simply drop it.
+    """
+    
+    __slots__ = ('params', 'index', 'values')
+    
+    def __init__(self, params, index: pd.Index, values):
+        self.params = params
+        self.index = index
+        self.values = values
+    
+    def __deepcopy__(self, memo):
+        return self
+
+
+def _keep_full_precision(df: pd.DataFrame, name: str, params, *values):
+    """
+    Attach float64 values for df's rows to df.attrs.
+    
+    Args:
+        df: DataFrame the values belong to
+        name: attrs key
+        params: Parameters the values were computed with
+        *values: float64 arrays aligned with df's rows
+    """
+    df.attrs[name] = _FullPrecision(params, df.index, values)
+
+
+def _full_precision(df: pd.DataFrame, name: str, params=None):
+    """
+    Look up float64 values attached by _keep_full_precision.
+    
+    Args:
+        df: DataFrame to look in
+        name: attrs key
+        params: Required parameters (any if None)
+    
+    Returns:
+        Tuple of float64 arrays, or None if there are none for df's rows
+        (e.g. after slicing) or they were computed with other parameters
+    """
+    record = df.attrs.get(name)
+    if not isinstance(record, _FullPrecision):
+        return None
+    if params is not None and record.params != params:
+        return None
+    if not record.index.equals(df.index):
+        return None
+    return record.values
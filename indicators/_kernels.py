@@ -0,0 +1,280 @@
+"""
+Compiled kernels shared by the indicator modules.
+
+These operate on raw NumPy arrays; the public indicator functions wrap
+their results back into pandas objects.
+"""
+
+import numpy as np
+from numba import njit, prange, types
+from typing import Tuple
+
+# Input types of the eagerly compiled kernels; readonly so the (often
+# read-only) arrays pandas hands out are accepted without a copy.
+# The moving-average kernels release the GIL, so symbols processed on
+# separate threads run them concurrently.
+F64_ARRAY = types.Array(types.float64, 1, 'A', readonly=True)
+F32_ARRAY = types.Array(types.float32, 1, 'A', readonly=True)
+
+# Series at least this long run the EMA as a chunked parallel scan; below
+# it thread start-up costs more than the recurrence itself
+PARALLEL_EMA_MIN_LENGTH = 200_000
+
+# Elements per chunk of the parallel EMA scan
+EMA_CHUNK_SIZE = 65_536
+
+# Smallest normal float64
+MIN_NORMAL = np.finfo(np.float64).tiny
+
+
+@njit(parallel=True, cache=True)
+def _ema_chunked(x: np.ndarray, alpha: float, start: int) -> np.ndarray:
+    """
+    Parallel EMA over a gap-free series.
+    
+    The recurrence y[i] = (1 - alpha) * y[i - 1] + alpha * x[i] is linear,
+    so each chunk can be run from a zero state independently and then
+    corrected by the true state entering it, decayed by (1 - alpha) per
+    step. Only the hand-off between chunks is serial.
+    
+    Args:
+        x: Input array, NaN before start and nowhere after it
+        alpha: Smoothing factor (0 < alpha <= 1)
+        start: Index of the first observation (the EMA seed)
+    
+    Returns:
+        Array of EMA values in the input's dtype
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=x.dtype)
+    out[:start] = np.nan
+    
+    decay = 1.0 - alpha
+    m = n - start
+    n_chunks = (m + EMA_CHUNK_SIZE - 1) // EMA_CHUNK_SIZE
+    local = np.empty(m, dtype=np.float64)
+    
+    # Chunk-local EMAs; only the first chunk starts from the real seed
+    for t in prange(n_chunks):
+        lo = t * EMA_CHUNK_SIZE
+        hi = min(lo + EMA_CHUNK_SIZE, m)
+        acc = 0.0
+        if t == 0:
+            acc = x[start]
+        else:
+            acc = alpha * x[start + lo]
+        local[lo] = acc
+        for i in range(lo + 1, hi):
+            acc = decay * acc + alpha * x[start + i]
+            local[i] = acc
+    
+    # True state entering each chunk
+    carry = np.zeros(n_chunks)
+    decay_chunk = decay ** EMA_CHUNK_SIZE
+    for t in range(1, n_chunks):
+        carry[t] = local[t * EMA_CHUNK_SIZE - 1] + decay_chunk * carry[t - 1]
+    
+    # Fold the decayed carry back into every chunk, stopping once it
+    # underflows (subnormal arithmetic is very slow and changes nothing)
+    for t in prange(n_chunks):
+        lo = t * EMA_CHUNK_SIZE
+        hi = min(lo + EMA_CHUNK_SIZE, m)
+        correction = carry[t]
+        i = lo
+        while i < hi and abs(correction) >= MIN_NORMAL:
+            correction *= decay
+            out[start + i] = local[i] + correction
+            i += 1
+        for j in range(i, hi):
+            out[start + j] = local[j]
+    
+    return out
+
+
+@njit([
+    types.float64[:](F64_ARRAY, types.float64),
+    types.float32[:](F32_ARRAY, types.float64)
+], nogil=True, cache=True)
+def _ema_alpha(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponential moving average with smoothing factor alpha.
+    
+    Same recurrence as pandas' ewm(alpha=alpha, adjust=False).mean():
+    seeded with the first observation, NaN inputs carry the previous value
+    forward and decay its weight across the gap. Results are identical
+    for gap-free input and agree to rounding otherwise.
+    
+    The recurrence runs in float64; the output has the input's dtype.
+    Series of PARALLEL_EMA_MIN_LENGTH or more observations without gaps
+    are handed to the chunked parallel scan, which agrees to rounding.
+    
+    Args:
+        x: Input array
+        alpha: Smoothing factor (0 < alpha <= 1)
+    
+    Returns:
+        Array of EMA values
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=x.dtype)
+    if n == 0:
+        return out
+    
+    if n >= PARALLEL_EMA_MIN_LENGTH:
+        start = 0
+        while start < n and x[start] != x[start]:
+            start += 1
+        gap_free = start < n
+        for i in range(start, n):
+            if x[i] != x[i]:
+                gap_free = False
+                break
+        if gap_free:
+            return _ema_chunked(x, alpha, start)
+    
+    decay = 1.0 - alpha
+    weighted = x[0]
+    old_wt = 1.0
+    out[0] = weighted
+    
+    for i in range(1, n):
+        cur = x[i]
+        is_observation = cur == cur
+        if weighted == weighted:
+            old_wt *= decay
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted
+    
+    return out
+
+
+@njit([
+    types.float64[:](F64_ARRAY, types.int64),
+    types.float32[:](F32_ARRAY, types.int64)
+], nogil=True, cache=True)
+def _ema_span(x: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average over a span.
+    
+    Equivalent to ewm(span=span, adjust=False).mean().
+    
+    Args:
+        x: Input array
+        span: EMA span (alpha = 2 / (span + 1))
+    
+    Returns:
+        Array of EMA values
+    """
+    return _ema_alpha(x, 2.0 / (span + 1.0))
+
+
+@njit(nogil=True, cache=True)
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing rolling mean matching pandas' rolling(window).mean().
+    
+    Uses the same Kahan-compensated add/remove updates and the same rule
+    that a window of identical values yields exactly that value, so
+    crossovers between smoothed lines tie and break exactly as before.
+    NaN inputs are skipped and the result needs a full window.
+    
+    Args:
+        values: Input array
+        window: Window length
+        
+    Returns:
+        Array of rolling means (NaN where the window is incomplete)
+    """
+    n = values.shape[0]
+    out = np.empty(n, dtype=values.dtype)
+    nobs = 0
+    neg_ct = 0
+    sum_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same_count = 0
+    prev_value = np.nan
+    
+    for i in range(n):
+        # Remove the value leaving the window
+        if i >= window:
+            val = values[i - window]
+            if val == val:
+                nobs -= 1
+                y = -val - comp_remove
+                t = sum_x + y
+                comp_remove = t - sum_x - y
+                sum_x = t
+                if np.signbit(val):
+                    neg_ct -= 1
+        
+        # Add the new value
+        val = values[i]
+        if val == val:
+            nobs += 1
+            y = val - comp_add
+            t = sum_x + y
+            comp_add = t - sum_x - y
+            sum_x = t
+            if np.signbit(val):
+                neg_ct += 1
+            if val == prev_value:
+                same_count += 1
+            else:
+                same_count = 1
+            prev_value = val
+        
+        if nobs >= window:
+            result = sum_x / nobs
+            if same_count >= nobs:
+                result = prev_value
+            elif neg_ct == 0 and result < 0:
+                result = 0.0
+            elif neg_ct == nobs and result > 0:
+                result = 0.0
+            out[i] = result
+        else:
+            out[i] = np.nan
+    
+    return out
+
+
+@njit(cache=True)
+def _crossover_signals(
+    fast: np.ndarray,
+    slow: np.ndarray,
+    overbought: float,
+    oversold: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flag crossovers of a fast line over a slow line in a single pass.
+    
+    Buy: fast crosses above slow while below oversold.
+    Sell: fast crosses below slow while above overbought.
+    Comparisons involving NaN are false, as with pandas.
+    
+    Args:
+        fast: Fast line (e.g., wt1, %K)
+        slow: Slow line (e.g., wt2, %D)
+        overbought: Overbought threshold
+        oversold: Oversold threshold
+    
+    Returns:
+        Tuple of (buy, sell) boolean arrays
+    """
+    n = fast.shape[0]
+    buy = np.zeros(n, dtype=np.bool_)
+    sell = np.zeros(n, dtype=np.bool_)
+    
+    for i in range(1, n):
+        f, s = fast[i], slow[i]
+        f_prev, s_prev = fast[i - 1], slow[i - 1]
+        buy[i] = f > s and f_prev <= s_prev and f < oversold
+        sell[i] = f < s and f_prev >= s_prev and f > overbought
+    
+    return buy, sell
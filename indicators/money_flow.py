@@ -7,12 +7,15 @@ buying and selling pressure. It's similar to RSI but volume-weighted.
 Key component of Market Cipher B for detecting money flow strength.
 """
 
+import logging
 import pandas as pd
 import numpy as np
+from numba import njit
 from typing import Tuple, Optional
 
+from indicators._frame import _with_columns, _keep_full_precision
 from utils.logger import get_indicator_logger
-from utils.config import get_indicator_params
+from utils.config import get_indicator_params, INDICATOR_DTYPE
 
 logger = get_indicator_logger()
 
@@ -46,6 +49,26 @@ def raw_money_flow(df: pd.DataFrame) -> pd.Series:
     return tp * df['volume']
 
 
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Calculate a trailing rolling sum over a NumPy array.
+    
+    Uses a direct convolution rather than a cumulative-sum difference so that
+    windows containing only zeros sum to exactly zero.
+    
+    Args:
+        values: Input array
+        window: Window length
+        
+    Returns:
+        Array of rolling sums (NaN for the first window-1 values)
+    """
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        out[window - 1:] = np.convolve(values, np.ones(window), mode='valid')
+    return out
+
+
 def money_flow_index(df: pd.DataFrame, period: int = 60) -> pd.Series:
     """
     Calculate Money Flow Index (MFI).
@@ -70,34 +93,47 @@ def money_flow_index(df: pd.DataFrame, period: int = 60) -> pd.Series:
         Series with MFI values
     """
     try:
-        tp = typical_price(df)
-        rmf = raw_money_flow(df)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
         
-        # Determine positive and negative money flow
-        positive_flow = pd.Series(0.0, index=df.index)
-        negative_flow = pd.Series(0.0, index=df.index)
+        tp = (high + low + close) * (1.0 / 3.0)
+        rmf = tp * volume
         
         # When typical price increases, it's positive money flow
         # When typical price decreases, it's negative money flow
-        tp_diff = tp.diff()
+        tp_diff = np.empty_like(tp)
+        tp_diff[:1] = 0.0
+        np.subtract(tp[1:], tp[:-1], out=tp_diff[1:])
         
-        positive_flow = rmf.where(tp_diff > 0, 0)
-        negative_flow = rmf.where(tp_diff < 0, 0)
+        positive_flow = np.where(tp_diff > 0, rmf, 0.0)
+        negative_flow = np.where(tp_diff < 0, rmf, 0.0)
         
         # Sum over the period
-        positive_mf = positive_flow.rolling(window=period).sum()
-        negative_mf = negative_flow.rolling(window=period).sum()
+        positive_mf = _rolling_sum(positive_flow, period)
+        negative_mf = _rolling_sum(negative_flow, period)
         
-        # Calculate money flow ratio
-        money_ratio = positive_mf / negative_mf
+        # Calculate money flow ratio and MFI where the ratio is defined
+        valid = (negative_mf > 0) & (positive_mf >= 0)
+        money_ratio = np.divide(
+            positive_mf,
+            negative_mf,
+            out=np.zeros_like(positive_mf),
+            where=valid
+        )
         
-        # Calculate MFI
-        mfi = 100 - (100 / (1 + money_ratio))
+        # Handle division by zero: only positive flow -> 100, no flow or
+        # warm-up -> neutral 50
+        mfi = np.where(
+            valid,
+            100.0 - (100.0 / (1.0 + money_ratio)),
+            np.where(positive_mf > 0, 100.0, 50.0)
+        )
+        mfi = pd.Series(mfi, index=df.index, copy=False)
         
-        # Handle division by zero
-        mfi = mfi.fillna(50)  # Neutral value when no negative flow
-        
-        logger.debug(f"MFI calculated: range [{mfi.min():.2f}, {mfi.max():.2f}]")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"MFI calculated: range [{mfi.min():.2f}, {mfi.max():.2f}]")
         
         return mfi
         
@@ -106,6 +142,203 @@ def money_flow_index(df: pd.DataFrame, period: int = 60) -> pd.Series:
         raise
 
 
+class MFIStreamState:
+    """
+    Incremental Money Flow Index for live candle streams.
+    
+    Keeps the last `period` positive and negative money flows in ring
+    buffers with their running sums, so each new candle costs O(1) instead
+    of recomputing the whole history. Values match money_flow_index.
+    """
+    
+    def __init__(self, period: int = 60):
+        """
+        Initialize an empty stream state.
+        
+        Args:
+            period: Lookback period
+        """
+        self.period = period
+        self.pos_ring = np.zeros(period)
+        self.neg_ring = np.zeros(period)
+        self.pmf = 0.0
+        self.nmf = 0.0
+        self.idx = 0
+        self.count = 0
+        self.prev_tp = None
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, period: int = 60) -> 'MFIStreamState':
+        """
+        Build a stream state primed with historical candles.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            period: Lookback period
+            
+        Returns:
+            MFIStreamState positioned after the last candle of df
+        """
+        state = cls(period)
+        for h, l, c, v in df[['high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64):
+            state.update(h, l, c, v)
+        return state
+    
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        """
+        Add a closed candle and return the MFI at that candle.
+        
+        Args:
+            high: Candle high
+            low: Candle low
+            close: Candle close
+            volume: Candle volume
+            
+        Returns:
+            MFI value (50 during warm-up)
+        """
+        tp = (high + low + close) * (1.0 / 3.0)
+        rmf = tp * volume
+        
+        pos = neg = 0.0
+        if self.prev_tp is not None:
+            if tp > self.prev_tp:
+                pos = rmf
+            elif tp < self.prev_tp:
+                neg = rmf
+        self.prev_tp = tp
+        
+        self.pmf += pos - self.pos_ring[self.idx]
+        self.nmf += neg - self.neg_ring[self.idx]
+        self.pos_ring[self.idx] = pos
+        self.neg_ring[self.idx] = neg
+        self.idx = (self.idx + 1) % self.period
+        self.count += 1
+        
+        # Re-sum once per lap so rounding drift cannot accumulate
+        if self.idx == 0:
+            self.pmf = self.pos_ring.sum()
+            self.nmf = self.neg_ring.sum()
+        
+        return self.value
+    
+    @property
+    def value(self) -> float:
+        """Current MFI value."""
+        if self.count < self.period:
+            return 50.0
+        if self.nmf > 0 and self.pmf >= 0:
+            return 100.0 - (100.0 / (1.0 + self.pmf / self.nmf))
+        return 100.0 if self.pmf > 0 else 50.0
+
+
+@njit(cache=True)
+def _local_extrema(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flag local minima and maxima over a centered rolling window.
+    
+    Equivalent to ``rolling(window, center=True).min() == values`` (and the
+    max counterpart), but computed in a single O(N) pass with monotonic
+    deques. Windows that are incomplete or contain NaN are never flagged.
+    
+    Args:
+        values: Input array
+        window: Window length
+        
+    Returns:
+        Tuple of (is_min, is_max) boolean arrays
+    """
+    n = values.shape[0]
+    is_min = np.zeros(n, dtype=np.bool_)
+    is_max = np.zeros(n, dtype=np.bool_)
+    
+    min_dq = np.empty(n, dtype=np.int64)
+    max_dq = np.empty(n, dtype=np.int64)
+    min_head = 0
+    min_tail = 0
+    max_head = 0
+    max_tail = 0
+    last_nan = -1
+    
+    for j in range(n):
+        x = values[j]
+        if np.isnan(x):
+            last_nan = j
+        else:
+            while min_tail > min_head and values[min_dq[min_tail - 1]] >= x:
+                min_tail -= 1
+            min_dq[min_tail] = j
+            min_tail += 1
+            
+            while max_tail > max_head and values[max_dq[max_tail - 1]] <= x:
+                max_tail -= 1
+            max_dq[max_tail] = j
+            max_tail += 1
+        
+        start = j - window + 1
+        while min_head < min_tail and min_dq[min_head] < start:
+            min_head += 1
+        while max_head < max_tail and max_dq[max_head] < start:
+            max_head += 1
+        
+        if start >= 0 and last_nan < start:
+            # pandas labels a centered window at start + window // 2
+            center = start + window // 2
+            is_min[center] = values[center] == values[min_dq[min_head]]
+            is_max[center] = values[center] == values[max_dq[max_head]]
+    
+    return is_min, is_max
+
+
+@njit(cache=True)
+def _divergence_scan(
+    price: np.ndarray,
+    mfi: np.ndarray,
+    price_min: np.ndarray,
+    price_max: np.ndarray,
+    lookback: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compiled divergence scan over local price extrema.
+    
+    For every local low (high), finds the most recent previous low (high)
+    within 2 * lookback candles and compares price and MFI at both points.
+    
+    Args:
+        price: Close prices
+        mfi: MFI values
+        price_min: Boolean mask of local price minima
+        price_max: Boolean mask of local price maxima
+        lookback: Period to look back for divergence
+        
+    Returns:
+        Tuple of (bullish_divergence, bearish_divergence) boolean arrays
+    """
+    n = price.shape[0]
+    span = lookback * 2
+    bullish = np.zeros(n, dtype=np.bool_)
+    bearish = np.zeros(n, dtype=np.bool_)
+    
+    for i in range(span, n):
+        # Bullish divergence: lower low in price, higher low in MFI
+        if price_min[i]:
+            for j in range(i - 1, i - span - 1, -1):
+                if price_min[j]:
+                    if price[i] < price[j] and mfi[i] > mfi[j]:
+                        bullish[i] = True
+                    break
+        
+        # Bearish divergence: higher high in price, lower high in MFI
+        if price_max[i]:
+            for j in range(i - 1, i - span - 1, -1):
+                if price_max[j]:
+                    if price[i] > price[j] and mfi[i] < mfi[j]:
+                        bearish[i] = True
+                    break
+    
+    return bullish, bearish
+
+
 def detect_mfi_divergence(
     df: pd.DataFrame,
     mfi: pd.Series,
@@ -125,41 +358,27 @@ def detect_mfi_divergence(
     Returns:
         Tuple of (bullish_divergence, bearish_divergence) boolean Series
     """
-    price = df['close']
+    price = df['close'].to_numpy(dtype=np.float64)
     
     # Find local minima and maxima
-    price_min = price.rolling(window=lookback, center=True).min() == price
-    price_max = price.rolling(window=lookback, center=True).max() == price
-    
-    mfi_min = mfi.rolling(window=lookback, center=True).min() == mfi
-    mfi_max = mfi.rolling(window=lookback, center=True).max() == mfi
-    
-    # Initialize divergence series
-    bullish_div = pd.Series(False, index=df.index)
-    bearish_div = pd.Series(False, index=df.index)
+    price_min, price_max = _local_extrema(price, lookback)
     
     # Detect divergences (simplified version)
     # In production, you'd want more sophisticated peak detection
-    for i in range(lookback * 2, len(df)):
-        # Bullish divergence
-        if price_min.iloc[i]:
-            # Look for previous low
-            prev_lows = price_min.iloc[i-lookback*2:i]
-            if prev_lows.any():
-                prev_idx = prev_lows[::-1].idxmax()
-                if price.iloc[i] < price.loc[prev_idx] and mfi.iloc[i] > mfi.loc[prev_idx]:
-                    bullish_div.iloc[i] = True
-        
-        # Bearish divergence
-        if price_max.iloc[i]:
-            # Look for previous high
-            prev_highs = price_max.iloc[i-lookback*2:i]
-            if prev_highs.any():
-                prev_idx = prev_highs[::-1].idxmax()
-                if price.iloc[i] > price.loc[prev_idx] and mfi.iloc[i] < mfi.loc[prev_idx]:
-                    bearish_div.iloc[i] = True
+    bullish, bearish = _divergence_scan(
+        price,
+        mfi.to_numpy(dtype=np.float64),
+        price_min,
+        price_max,
+        lookback
+    )
+    
+    # Wrap the kernel's bool buffers without copying them
+    bullish_div = pd.Series(bullish, index=df.index, copy=False)
+    bearish_div = pd.Series(bearish, index=df.index, copy=False)
     
-    logger.debug(f"MFI divergences: {bullish_div.sum()} bullish, {bearish_div.sum()} bearish")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"MFI divergences: {np.count_nonzero(bullish_div)} bullish, {np.count_nonzero(bearish_div)} bearish")
     
     return bullish_div, bearish_div
 
@@ -180,13 +399,23 @@ def detect_mfi_signals(
     Returns:
         Tuple of (buy_signals, sell_signals) boolean Series
     """
+    values = mfi.to_numpy(dtype=np.float64)
+    curr = values[1:]
+    prev = values[:-1]
+    
     # Buy signal: MFI crosses above oversold level
-    buy_signals = (mfi > oversold) & (mfi.shift(1) <= oversold)
+    buy = np.zeros(values.shape[0], dtype=np.bool_)
+    np.logical_and(curr > oversold, prev <= oversold, out=buy[1:])
     
     # Sell signal: MFI crosses below overbought level
-    sell_signals = (mfi < overbought) & (mfi.shift(1) >= overbought)
+    sell = np.zeros(values.shape[0], dtype=np.bool_)
+    np.logical_and(curr < overbought, prev >= overbought, out=sell[1:])
+    
+    buy_signals = pd.Series(buy, index=mfi.index, copy=False)
+    sell_signals = pd.Series(sell, index=mfi.index, copy=False)
     
-    logger.debug(f"MFI signals: {buy_signals.sum()} buys, {sell_signals.sum()} sells")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"MFI signals: {np.count_nonzero(buy_signals)} buys, {np.count_nonzero(sell_signals)} sells")
     
     return buy_signals, sell_signals
 
@@ -216,30 +445,37 @@ def add_money_flow(
         overbought = overbought or params.get('overbought_level', 80)
         oversold = oversold or params.get('oversold_level', 20)
     
-    logger.info(f"Calculating Money Flow Index: period={period}")
+    logger.debug(f"Calculating Money Flow Index: period={period}")
     
     # Calculate MFI
     mfi = money_flow_index(df, period)
     
-    # Add to DataFrame
-    df = df.copy()
-    df['mfi'] = mfi
-    
     # Detect signals
     buy_signals, sell_signals = detect_mfi_signals(mfi, overbought, oversold)
-    df['mfi_buy'] = buy_signals
-    df['mfi_sell'] = sell_signals
     
     # Detect divergences
     bullish_div, bearish_div = detect_mfi_divergence(df, mfi)
-    df['mfi_bullish_div'] = bullish_div
-    df['mfi_bearish_div'] = bearish_div
     
-    logger.info(
-        f"✅ MFI added: {len(df)} candles, {buy_signals.sum()} buy signals, "
-        f"{sell_signals.sum()} sell signals, {bullish_div.sum()} bullish divergences"
+    # Add to DataFrame (leaves the input untouched without copying it); the
+    # signals above are detected on the float64 MFI
+    df = _with_columns(
+        df,
+        mfi=mfi.astype(INDICATOR_DTYPE),
+        mfi_buy=buy_signals,
+        mfi_sell=sell_signals,
+        mfi_bullish_div=bullish_div,
+        mfi_bearish_div=bearish_div
     )
     
+    # Keep the float64 MFI for feature engineering
+    _keep_full_precision(df, 'mfi', period, mfi.to_numpy())
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"✅ MFI added: {len(df)} candles, {np.count_nonzero(buy_signals)} buy signals, "
+            f"{np.count_nonzero(sell_signals)} sell signals, {np.count_nonzero(bullish_div)} bullish divergences"
+        )
+    
     return df
 
 
@@ -264,13 +500,15 @@ if __name__ == '__main__':
     print("\n🔬 Calculating Money Flow Index...")
     df = add_money_flow(df, period=60, overbought=80, oversold=20)
     
-    # Display results
+    # Display results (one pass for all ranges and one for all counts)
+    ranges = df[['mfi']].agg(['min', 'max'])
+    counts = df[['mfi_buy', 'mfi_sell', 'mfi_bullish_div', 'mfi_bearish_div']].sum()
     print(f"\n✅ MFI calculated!")
-    print(f"   MFI range: [{df['mfi'].min():.2f}, {df['mfi'].max():.2f}]")
-    print(f"   Buy signals: {df['mfi_buy'].sum()}")
-    print(f"   Sell signals: {df['mfi_sell'].sum()}")
-    print(f"   Bullish divergences: {df['mfi_bullish_div'].sum()}")
-    print(f"   Bearish divergences: {df['mfi_bearish_div'].sum()}")
+    print(f"   MFI range: [{ranges.at['min', 'mfi']:.2f}, {ranges.at['max', 'mfi']:.2f}]")
+    print(f"   Buy signals: {counts['mfi_buy']}")
+    print(f"   Sell signals: {counts['mfi_sell']}")
+    print(f"   Bullish divergences: {counts['mfi_bullish_div']}")
+    print(f"   Bearish divergences: {counts['mfi_bearish_div']}")
     
     # Show latest values
     print("\n📊 Latest MFI values:")
@@ -7,16 +7,168 @@ of recent price changes to evaluate overbought or oversold conditions.
 Part of Market Cipher B indicator suite.
 """
 
+import logging
 import pandas as pd
 import numpy as np
+from functools import lru_cache
+from numba import njit, types
 from typing import Tuple, Optional
 
+from indicators._kernels import F64_ARRAY, F32_ARRAY, _rolling_mean, _crossover_signals
+from indicators._frame import _with_columns, _keep_full_precision, _full_precision
 from utils.logger import get_indicator_logger
-from utils.config import get_indicator_params
+from utils.config import get_indicator_params, INDICATOR_DTYPE
 
 logger = get_indicator_logger()
 
 
+@lru_cache(maxsize=None)
+def _rsi_kernel(period: int):
+    """
+    Build the compiled Wilder RSI kernel for one period.
+    
+    The period is baked into the kernel as a constant, so alpha and its
+    complement are literals LLVM can fold instead of loop-carried loads.
+    Kernels are built once per period and cached on disk by Numba.
+    
+    Args:
+        period: RSI period
+        
+    Returns:
+        Compiled function mapping a close price array to RSI values
+    """
+    alpha = 1.0 / period
+    decay = 1.0 - alpha
+    
+    @njit([
+        types.float64[:](F64_ARRAY),
+        types.float32[:](F32_ARRAY)
+    ], cache=True)
+    def kernel(close: np.ndarray) -> np.ndarray:
+        """
+        Compiled Wilder RSI over a close price array.
+        
+        Walks the prices once, splitting each change into gain and loss
+        with branchless selects and updating both Wilder averages (EMA
+        with alpha = 1 / period, seeded with the first value like
+        ewm(adjust=False)) in registers, so neither series is ever
+        materialised.
+        
+        Args:
+            close: Close prices
+            
+        Returns:
+            Array of RSI values in the input's dtype (50 where both
+            averages are zero)
+        """
+        n = close.shape[0]
+        out = np.empty(n, dtype=close.dtype)
+        if n == 0:
+            return out
+        
+        # The first candle has no change, so both averages start at zero
+        avg_gain = 0.0
+        avg_loss = 0.0
+        out[0] = 50.0
+        
+        for i in range(1, n):
+            # NaN changes count as neither gain nor loss
+            delta = close[i] - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            
+            avg_gain = decay * avg_gain + alpha * gain
+            avg_loss = decay * avg_loss + alpha * loss
+            
+            if avg_loss > 0:
+                out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            elif avg_gain > 0:
+                out[i] = 100.0
+            else:
+                out[i] = 50.0
+        
+        return out
+    
+    return kernel
+
+
+@lru_cache(maxsize=None)
+def _stochrsi_kernel(stoch_period: int, k_smooth: int, d_smooth: int):
+    """
+    Build the compiled Stochastic RSI kernel for one set of lengths.
+    
+    The window lengths are baked in as constants, which lets LLVM unroll
+    and simplify the deque and rolling-mean bookkeeping around them.
+    
+    Args:
+        stoch_period: Period for Stochastic calculation
+        k_smooth: Smoothing period for %K
+        d_smooth: Smoothing period for %D
+        
+    Returns:
+        Compiled function mapping RSI values to a (%K, %D) tuple of arrays
+    """
+    @njit(cache=True)
+    def kernel(rsi_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compiled Stochastic RSI %K and %D.
+        
+        Rolling min/max come from monotonic deques, so the raw oscillator
+        is a single O(N) pass over the RSI values; %K and %D are O(N)
+        rolling means.
+        
+        Args:
+            rsi_values: RSI values
+            
+        Returns:
+            Tuple of (%K, %D) arrays (NaN until each SMA window is full)
+        """
+        n = rsi_values.shape[0]
+        stoch = np.empty(n, dtype=rsi_values.dtype)
+        
+        min_dq = np.empty(n, dtype=np.int64)
+        max_dq = np.empty(n, dtype=np.int64)
+        min_head = 0
+        min_tail = 0
+        max_head = 0
+        max_tail = 0
+        
+        for i in range(n):
+            x = rsi_values[i]
+            
+            while min_tail > min_head and rsi_values[min_dq[min_tail - 1]] >= x:
+                min_tail -= 1
+            min_dq[min_tail] = i
+            min_tail += 1
+            
+            while max_tail > max_head and rsi_values[max_dq[max_tail - 1]] <= x:
+                max_tail -= 1
+            max_dq[max_tail] = i
+            max_tail += 1
+            
+            start = i - stoch_period + 1
+            if min_dq[min_head] < start:
+                min_head += 1
+            if max_dq[max_head] < start:
+                max_head += 1
+            
+            # Neutral value during warm-up and when the RSI range is flat
+            stoch[i] = 50.0
+            if start >= 0:
+                low = rsi_values[min_dq[min_head]]
+                high = rsi_values[max_dq[max_head]]
+                if high > low:
+                    stoch[i] = (x - low) / (high - low) * 100.0
+        
+        # %K: SMA of StochRSI, %D: SMA of %K
+        k = _rolling_mean(stoch, k_smooth)
+        d = _rolling_mean(k, d_smooth)
+        
+        return k, d
+    
+    return kernel
+
+
 def rsi(series: pd.Series, period: int = 14) -> pd.Series:
     """
     Calculate Relative Strength Index (RSI).
@@ -36,25 +188,15 @@ def rsi(series: pd.Series, period: int = 14) -> pd.Series:
         Series with RSI values
     """
     try:
-        # Calculate price changes
-        delta = series.diff()
-        
-        # Separate gains and losses
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        # Calculate average gain and loss using EMA (Wilder's smoothing)
-        avg_gain = gain.ewm(alpha=1/period, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1/period, adjust=False).mean()
+        # Gains, losses, Wilder's smoothing and RS in a single compiled pass
+        rsi_values = pd.Series(
+            _rsi_kernel(period)(series.to_numpy(dtype=INDICATOR_DTYPE)),
+            index=series.index,
+            copy=False
+        )
         
-        # Calculate RS and RSI
-        rs = avg_gain / avg_loss
-        rsi_values = 100 - (100 / (1 + rs))
-        
-        # Handle division by zero
-        rsi_values = rsi_values.fillna(50)
-        
-        logger.debug(f"RSI calculated: range [{rsi_values.min():.2f}, {rsi_values.max():.2f}]")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"RSI calculated: range [{rsi_values.min():.2f}, {rsi_values.max():.2f}]")
         
         return rsi_values
         
@@ -90,29 +232,64 @@ def stochastic_rsi(
         d_smooth: Smoothing period for %D
         
     Returns:
-        Tuple of (%K, %D) Series
+        Tuple of (%K, %D) float64 Series
     """
-    try:
-        # Calculate RSI
-        rsi_values = rsi(series, rsi_period)
-        
-        # Calculate Stochastic of RSI
-        rsi_low = rsi_values.rolling(window=stoch_period).min()
-        rsi_high = rsi_values.rolling(window=stoch_period).max()
-        
-        stoch_rsi = (rsi_values - rsi_low) / (rsi_high - rsi_low)
-        stoch_rsi = stoch_rsi.fillna(0.5)  # Neutral value
-        
-        # Scale to 0-100
-        stoch_rsi = stoch_rsi * 100
+    # Calculate RSI, kept in float64 (see stochastic_rsi_from_rsi)
+    rsi_values = _rsi_float64(series, rsi_period)
+    
+    return stochastic_rsi_from_rsi(rsi_values, stoch_period, k_smooth, d_smooth)
+
+
+def _rsi_float64(series: pd.Series, period: int) -> pd.Series:
+    """
+    Calculate RSI at full precision, whatever INDICATOR_DTYPE is.
+    
+    Args:
+        series: Price series
+        period: RSI period
         
-        # Calculate %K (smoothed StochRSI)
-        k = stoch_rsi.rolling(window=k_smooth).mean()
+    Returns:
+        Series with float64 RSI values
+    """
+    return pd.Series(
+        _rsi_kernel(period)(series.to_numpy(dtype=np.float64)),
+        index=series.index,
+        copy=False
+    )
+
+
+def stochastic_rsi_from_rsi(
+    rsi_values: pd.Series,
+    stoch_period: int = 14,
+    k_smooth: int = 3,
+    d_smooth: int = 3
+) -> Tuple[pd.Series, pd.Series]:
+    """
+    Calculate Stochastic RSI from precomputed RSI values.
+    
+    Runs in float64. Over flat price stretches the RSI only drifts in its
+    last digits; narrower input rounds the window to a single value, which
+    collapses the range and forces %K to the neutral 50.
+    
+    Args:
+        rsi_values: RSI series (float64 for full accuracy)
+        stoch_period: Period for Stochastic calculation
+        k_smooth: Smoothing period for %K
+        d_smooth: Smoothing period for %D
         
-        # Calculate %D (signal line - smoothed %K)
-        d = k.rolling(window=d_smooth).mean()
+    Returns:
+        Tuple of (%K, %D) float64 Series
+    """
+    try:
+        # Calculate Stochastic of RSI, %K (smoothed StochRSI) and
+        # %D (signal line - smoothed %K) in one pass
+        kernel = _stochrsi_kernel(stoch_period, k_smooth, d_smooth)
+        k_values, d_values = kernel(rsi_values.to_numpy(dtype=np.float64))
+        k = pd.Series(k_values, index=rsi_values.index, copy=False)
+        d = pd.Series(d_values, index=rsi_values.index, copy=False)
         
-        logger.debug(f"StochRSI calculated: K range [{k.min():.2f}, {k.max():.2f}]")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"StochRSI calculated: K range [{k.min():.2f}, {k.max():.2f}]")
         
         return k, d
         
@@ -137,13 +314,23 @@ def detect_rsi_signals(
     Returns:
         Tuple of (buy_signals, sell_signals) boolean Series
     """
+    values = rsi_values.to_numpy()
+    curr = values[1:]
+    prev = values[:-1]
+    
     # Buy signal: RSI crosses above oversold level
-    buy_signals = (rsi_values > oversold) & (rsi_values.shift(1) <= oversold)
+    buy = np.zeros(values.shape[0], dtype=np.bool_)
+    np.logical_and(curr > oversold, prev <= oversold, out=buy[1:])
     
     # Sell signal: RSI crosses below overbought level
-    sell_signals = (rsi_values < overbought) & (rsi_values.shift(1) >= overbought)
+    sell = np.zeros(values.shape[0], dtype=np.bool_)
+    np.logical_and(curr < overbought, prev >= overbought, out=sell[1:])
     
-    logger.debug(f"RSI signals: {buy_signals.sum()} buys, {sell_signals.sum()} sells")
+    buy_signals = pd.Series(buy, index=rsi_values.index, copy=False)
+    sell_signals = pd.Series(sell, index=rsi_values.index, copy=False)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"RSI signals: {np.count_nonzero(buy_signals)} buys, {np.count_nonzero(sell_signals)} sells")
     
     return buy_signals, sell_signals
 
@@ -169,17 +356,14 @@ def detect_stochrsi_signals(
     Returns:
         Tuple of (buy_signals, sell_signals) boolean Series
     """
-    # Detect crossovers
-    cross_up = (k > d) & (k.shift(1) <= d.shift(1))
-    cross_down = (k < d) & (k.shift(1) >= d.shift(1))
-    
-    # Buy signals: cross up in oversold region
-    buy_signals = cross_up & (k < oversold)
+    # Crossovers and thresholds in one compiled pass
+    buy, sell = _crossover_signals(k.to_numpy(), d.to_numpy(), overbought, oversold)
     
-    # Sell signals: cross down in overbought region
-    sell_signals = cross_down & (k > overbought)
+    buy_signals = pd.Series(buy, index=k.index, copy=False)
+    sell_signals = pd.Series(sell, index=k.index, copy=False)
     
-    logger.debug(f"StochRSI signals: {buy_signals.sum()} buys, {sell_signals.sum()} sells")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"StochRSI signals: {np.count_nonzero(buy_signals)} buys, {np.count_nonzero(sell_signals)} sells")
     
     return buy_signals, sell_signals
 
@@ -209,25 +393,31 @@ def add_rsi(
         overbought = overbought or params.get('overbought_level', 70)
         oversold = oversold or params.get('oversold_level', 30)
     
-    logger.info(f"Calculating RSI: period={period}")
+    logger.debug(f"Calculating RSI: period={period}")
     
-    # Calculate RSI
-    rsi_values = rsi(df['close'], period)
-    
-    # Add to DataFrame
-    df = df.copy()
-    df['rsi'] = rsi_values
+    # Calculate RSI in float64; the column is stored in INDICATOR_DTYPE
+    rsi_values = _rsi_float64(df['close'], period)
     
     # Detect signals
     buy_signals, sell_signals = detect_rsi_signals(rsi_values, overbought, oversold)
-    df['rsi_buy'] = buy_signals
-    df['rsi_sell'] = sell_signals
     
-    logger.info(
-        f"✅ RSI added: {len(df)} candles, {buy_signals.sum()} buy signals, "
-        f"{sell_signals.sum()} sell signals"
+    # Add to DataFrame (leaves the input untouched without copying it)
+    df = _with_columns(
+        df,
+        rsi=rsi_values.astype(INDICATOR_DTYPE),
+        rsi_buy=buy_signals,
+        rsi_sell=sell_signals
     )
     
+    # Keep the float64 RSI so add_stochastic_rsi can reuse it
+    _keep_full_precision(df, 'rsi', period, rsi_values.to_numpy())
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"✅ RSI added: {len(df)} candles, {np.count_nonzero(buy_signals)} buy signals, "
+            f"{np.count_nonzero(sell_signals)} sell signals"
+        )
+    
     return df
 
 
@@ -250,6 +440,12 @@ def add_stochastic_rsi(
         
     Returns:
         DataFrame with added columns: stoch_k, stoch_d, stoch_buy, stoch_sell
+        
+    Note:
+        If add_rsi already ran on df with the same period, its float64 RSI
+        is reused instead of being recomputed. Signals are detected on the
+        float64 %K and %D, which are then stored in INDICATOR_DTYPE; the
+        float64 values stay available in df.attrs['stoch_rsi'].
     """
     # Get parameters from config if not provided
     if any(p is None for p in [rsi_period, stoch_period, k_smooth, d_smooth]):
@@ -259,26 +455,41 @@ def add_stochastic_rsi(
         k_smooth = k_smooth or params.get('k_smooth', 3)
         d_smooth = d_smooth or params.get('d_smooth', 3)
     
-    logger.info(f"Calculating Stochastic RSI: rsi_period={rsi_period}, stoch_period={stoch_period}")
+    logger.debug(f"Calculating Stochastic RSI: rsi_period={rsi_period}, stoch_period={stoch_period}")
     
-    # Calculate StochRSI
-    k, d = stochastic_rsi(df['close'], rsi_period, stoch_period, k_smooth, d_smooth)
-    
-    # Add to DataFrame
-    df = df.copy()
-    df['stoch_k'] = k
-    df['stoch_d'] = d
+    # Calculate StochRSI, reusing the float64 RSI add_rsi kept (the stored
+    # column may be narrower, which would lose flat-stretch ranges)
+    full_rsi = _full_precision(df, 'rsi', rsi_period)
+    if full_rsi is not None:
+        rsi_values = pd.Series(full_rsi[0], index=df.index, copy=False)
+        k, d = stochastic_rsi_from_rsi(rsi_values, stoch_period, k_smooth, d_smooth)
+    else:
+        k, d = stochastic_rsi(df['close'], rsi_period, stoch_period, k_smooth, d_smooth)
     
     # Detect signals
     buy_signals, sell_signals = detect_stochrsi_signals(k, d)
-    df['stoch_buy'] = buy_signals
-    df['stoch_sell'] = sell_signals
     
-    logger.info(
-        f"✅ StochRSI added: {len(df)} candles, {buy_signals.sum()} buy signals, "
-        f"{sell_signals.sum()} sell signals"
+    # Add to DataFrame (leaves the input untouched without copying it)
+    df = _with_columns(
+        df,
+        stoch_k=k.astype(INDICATOR_DTYPE),
+        stoch_d=d.astype(INDICATOR_DTYPE),
+        stoch_buy=buy_signals,
+        stoch_sell=sell_signals
     )
     
+    # Keep the float64 %K and %D for feature engineering's crossovers
+    _keep_full_precision(
+        df, 'stoch_rsi', (rsi_period, stoch_period, k_smooth, d_smooth),
+        k.to_numpy(), d.to_numpy()
+    )
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"✅ StochRSI added: {len(df)} candles, {np.count_nonzero(buy_signals)} buy signals, "
+            f"{np.count_nonzero(sell_signals)} sell signals"
+        )
+    
     return df
 
 
@@ -307,14 +518,16 @@ if __name__ == '__main__':
     print("\n🔬 Calculating Stochastic RSI...")
     df = add_stochastic_rsi(df, rsi_period=14, stoch_period=14, k_smooth=3, d_smooth=3)
     
-    # Display results
+    # Display results (one pass for all ranges and one for all counts)
+    ranges = df[['rsi', 'stoch_k']].agg(['min', 'max'])
+    counts = df[['rsi_buy', 'rsi_sell', 'stoch_buy', 'stoch_sell']].sum()
     print(f"\n✅ Indicators calculated!")
-    print(f"   RSI range: [{df['rsi'].min():.2f}, {df['rsi'].max():.2f}]")
-    print(f"   RSI buy signals: {df['rsi_buy'].sum()}")
-    print(f"   RSI sell signals: {df['rsi_sell'].sum()}")
-    print(f"   StochRSI %K range: [{df['stoch_k'].min():.2f}, {df['stoch_k'].max():.2f}]")
-    print(f"   StochRSI buy signals: {df['stoch_buy'].sum()}")
-    print(f"   StochRSI sell signals: {df['stoch_sell'].sum()}")
+    print(f"   RSI range: [{ranges.at['min', 'rsi']:.2f}, {ranges.at['max', 'rsi']:.2f}]")
+    print(f"   RSI buy signals: {counts['rsi_buy']}")
+    print(f"   RSI sell signals: {counts['rsi_sell']}")
+    print(f"   StochRSI %K range: [{ranges.at['min', 'stoch_k']:.2f}, {ranges.at['max', 'stoch_k']:.2f}]")
+    print(f"   StochRSI buy signals: {counts['stoch_buy']}")
+    print(f"   StochRSI sell signals: {counts['stoch_sell']}")
     
     # Show latest values
     print("\n📊 Latest RSI values:")
@@ -8,12 +8,16 @@ to detect potential trend reversals.
 Based on TradingView's WaveTrend by LazyBear.
 """
 
+import logging
 import pandas as pd
 import numpy as np
+import numexpr as ne
 from typing import Tuple, Optional
 
+from indicators._kernels import _ema_span, _rolling_mean, _crossover_signals
+from indicators._frame import _with_columns, _keep_full_precision
 from utils.logger import get_indicator_logger
-from utils.config import get_indicator_params
+from utils.config import get_indicator_params, INDICATOR_DTYPE
 
 logger = get_indicator_logger()
 
@@ -42,7 +46,11 @@ def ema(series: pd.Series, period: int) -> pd.Series:
     Returns:
         Series with EMA values
     """
-    return series.ewm(span=period, adjust=False).mean()
+    return pd.Series(
+        _ema_span(series.to_numpy(dtype=INDICATOR_DTYPE), period),
+        index=series.index,
+        copy=False
+    )
 
 
 def wavetrend(
@@ -80,27 +88,42 @@ def wavetrend(
         Tuple of (wt1, wt2, vwap) Series
     """
     try:
-        # Step 1: Calculate typical price (hlc3)
-        ap = hlc3(df)
+        # Step 1: Calculate typical price (hlc3), on raw arrays from here on
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
+        close = df['close'].to_numpy()
+        ap_values = ((high + low + close) / 3).astype(INDICATOR_DTYPE, copy=False)
         
         # Step 2: Calculate ESA (Exponential Simple Average)
-        esa = ema(ap, channel_len)
+        esa = _ema_span(ap_values, channel_len)
         
         # Step 3: Calculate distance (d)
-        d = ema(abs(ap - esa), channel_len)
+        dev = np.subtract(ap_values, esa)
+        np.abs(dev, out=dev)
+        d = _ema_span(dev, channel_len)
         
         # Step 4: Calculate Channel Index (ci)
-        # ci = (hlc3 - esa) / (0.015 * d)
-        ci = (ap - esa) / (0.015 * d)
+        # ci = (hlc3 - esa) / (0.015 * d) as one fused pass, written over
+        # the now unused deviation buffer
+        ci = ne.evaluate(
+            '(ap - esa) / (0.015 * d)',
+            local_dict={'ap': ap_values, 'esa': esa, 'd': d},
+            out=dev
+        )
         
         # Step 5: Calculate wt1 (TCI - Trend Channel Index)
-        wt1 = ema(ci, avg_len)
+        wt1_values = _ema_span(ci, avg_len)
         
         # Step 6: Calculate wt2 (signal line)
-        # Using SMA of 4 periods on wt1
-        wt2 = wt1.rolling(window=4).mean()
+        # Using SMA of 4 periods on wt1 (in float64, like pandas' rolling)
+        wt2_values = _rolling_mean(wt1_values.astype(np.float64), 4)
         
-        logger.debug(f"WaveTrend calculated: wt1 range [{wt1.min():.2f}, {wt1.max():.2f}]")
+        wt1 = pd.Series(wt1_values, index=df.index, copy=False)
+        wt2 = pd.Series(wt2_values, index=df.index, copy=False)
+        ap = pd.Series(ap_values, index=df.index, copy=False)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"WaveTrend calculated: wt1 range [{wt1.min():.2f}, {wt1.max():.2f}]")
         
         return wt1, wt2, ap
         
@@ -130,17 +153,14 @@ def detect_wavetrend_signals(
     Returns:
         Tuple of (buy_signals, sell_signals) boolean Series
     """
-    # Detect crossovers
-    cross_up = (wt1 > wt2) & (wt1.shift(1) <= wt2.shift(1))
-    cross_down = (wt1 < wt2) & (wt1.shift(1) >= wt2.shift(1))
-    
-    # Buy signals: cross up in oversold region
-    buy_signals = cross_up & (wt1 < oversold)
+    # Crossovers and thresholds in one compiled pass
+    buy, sell = _crossover_signals(wt1.to_numpy(), wt2.to_numpy(), overbought, oversold)
     
-    # Sell signals: cross down in overbought region
-    sell_signals = cross_down & (wt1 > overbought)
+    buy_signals = pd.Series(buy, index=wt1.index, copy=False)
+    sell_signals = pd.Series(sell, index=wt1.index, copy=False)
     
-    logger.debug(f"WaveTrend signals: {buy_signals.sum()} buys, {sell_signals.sum()} sells")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"WaveTrend signals: {np.count_nonzero(buy_signals)} buys, {np.count_nonzero(sell_signals)} sells")
     
     return buy_signals, sell_signals
 
@@ -173,22 +193,31 @@ def add_wavetrend(
         overbought = overbought or params.get('overbought_level', 60)
         oversold = oversold or params.get('oversold_level', -60)
     
-    logger.info(f"Calculating WaveTrend: channel_len={channel_len}, avg_len={avg_len}")
+    logger.debug(f"Calculating WaveTrend: channel_len={channel_len}, avg_len={avg_len}")
     
     # Calculate WaveTrend
     wt1, wt2, _ = wavetrend(df, channel_len, avg_len, overbought, oversold)
     
-    # Add to DataFrame
-    df = df.copy()
-    df['wt1'] = wt1
-    df['wt2'] = wt2
-    
     # Detect signals
     buy_signals, sell_signals = detect_wavetrend_signals(wt1, wt2, overbought, oversold)
-    df['wt_buy'] = buy_signals
-    df['wt_sell'] = sell_signals
     
-    logger.info(f"✅ WaveTrend added: {len(df)} candles, {buy_signals.sum()} buy signals, {sell_signals.sum()} sell signals")
+    # Add to DataFrame (leaves the input untouched without copying it); wt2
+    # is averaged in float64 and stored in INDICATOR_DTYPE like wt1
+    df = _with_columns(
+        df,
+        wt1=wt1,
+        wt2=wt2.astype(INDICATOR_DTYPE),
+        wt_buy=buy_signals,
+        wt_sell=sell_signals
+    )
+    
+    # Keep the unrounded lines for feature engineering's crossovers
+    _keep_full_precision(
+        df, 'wavetrend', (channel_len, avg_len), wt1.to_numpy(), wt2.to_numpy()
+    )
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"✅ WaveTrend added: {len(df)} candles, {np.count_nonzero(buy_signals)} buy signals, {np.count_nonzero(sell_signals)} sell signals")
     
     return df
 
@@ -214,12 +243,14 @@ if __name__ == '__main__':
     print("\n🔬 Calculating WaveTrend indicator...")
     df = add_wavetrend(df, channel_len=9, avg_len=12, overbought=60, oversold=-60)
     
-    # Display results
+    # Display results (one pass for all ranges and one for all counts)
+    ranges = df[['wt1', 'wt2']].agg(['min', 'max'])
+    counts = df[['wt_buy', 'wt_sell']].sum()
     print(f"\n✅ WaveTrend calculated!")
-    print(f"   wt1 range: [{df['wt1'].min():.2f}, {df['wt1'].max():.2f}]")
-    print(f"   wt2 range: [{df['wt2'].min():.2f}, {df['wt2'].max():.2f}]")
-    print(f"   Buy signals: {df['wt_buy'].sum()}")
-    print(f"   Sell signals: {df['wt_sell'].sum()}")
+    print(f"   wt1 range: [{ranges.at['min', 'wt1']:.2f}, {ranges.at['max', 'wt1']:.2f}]")
+    print(f"   wt2 range: [{ranges.at['min', 'wt2']:.2f}, {ranges.at['max', 'wt2']:.2f}]")
+    print(f"   Buy signals: {counts['wt_buy']}")
+    print(f"   Sell signals: {counts['wt_sell']}")
     
     # Show latest values
     print("\n📊 Latest WaveTrend values:")
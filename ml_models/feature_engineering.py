@@ -9,18 +9,201 @@ Extracts features from technical indicators for ML model training:
 - Volume features
 """
 
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit
 from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 
 from utils.logger import get_logger
+from utils.config import FEATURE_DTYPE
+from indicators._kernels import _ema_span, _rolling_mean
+from indicators._frame import _full_precision
 from indicators.wavetrend import add_wavetrend
 from indicators.money_flow import add_money_flow
 from indicators.rsi import add_rsi, add_stochastic_rsi
 
 logger = get_logger('features')
 
+# Row order of _price_action_features
+PRICE_ACTION_FEATURES = [
+    'price_change', 'price_change_2', 'price_change_5',
+    'hl_range', 'close_position', 'gap',
+    'body_size', 'upper_shadow', 'lower_shadow'
+]
+
+
+def _pct_change(values: np.ndarray) -> np.ndarray:
+    """
+    One-step percentage change of an array, like Series.pct_change().
+    
+    Args:
+        values: Input array
+        
+    Returns:
+        Array of changes (NaN first element)
+    """
+    out = np.empty_like(values)
+    out[0:1] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(values[1:], values[:-1], out=out[1:])
+    out[1:] -= 1.0
+    return out
+
+
+@njit(nogil=True, cache=True, error_model='numpy')
+def _price_action_features(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray
+) -> np.ndarray:
+    """
+    Compute all price action features in one pass over the candles.
+    
+    Rows of the result, in order: price_change, price_change_2,
+    price_change_5, hl_range, close_position, gap, body_size,
+    upper_shadow, lower_shadow. Lagged features are NaN until enough
+    history exists, as with pct_change()/shift().
+    
+    Args:
+        open_: Open prices
+        high: High prices
+        low: Low prices
+        close: Close prices
+        
+    Returns:
+        Array of shape (9, n) in float64
+    """
+    n = close.shape[0]
+    out = np.empty((9, n))
+    
+    # Every feature divides by a close, so take the reciprocals once and
+    # multiply from there on
+    inv_close = np.empty(n)
+    for i in range(n):
+        inv_close[i] = 1.0 / close[i]
+    
+    for i in range(n):
+        o = float(open_[i])
+        h = float(high[i])
+        l = float(low[i])
+        c = float(close[i])
+        inv_c = inv_close[i]
+        
+        # Price changes over 1, 2 and 5 candles
+        out[0, i] = c * inv_close[i - 1] - 1.0 if i >= 1 else np.nan
+        out[1, i] = c * inv_close[i - 2] - 1.0 if i >= 2 else np.nan
+        out[2, i] = c * inv_close[i - 5] - 1.0 if i >= 5 else np.nan
+        
+        # High-Low range and close position in it (0.5 for flat candles)
+        out[3, i] = (h - l) * inv_c
+        position = (c - l) / (h - l)
+        out[4, i] = position if position == position else 0.5
+        
+        # Gap from previous close
+        out[5, i] = (o - close[i - 1]) * inv_close[i - 1] if i >= 1 else np.nan
+        
+        # Body size and shadows (body bounds skip a NaN open or close)
+        out[6, i] = abs(c - o) * inv_c
+        if o != o:
+            top = c
+            bottom = c
+        elif c != c:
+            top = o
+            bottom = o
+        else:
+            top = max(o, c)
+            bottom = min(o, c)
+        out[7, i] = (h - top) * inv_c
+        out[8, i] = (bottom - l) * inv_c
+    
+    return out
+
+
+def _indicator_values(df: pd.DataFrame, name: str, columns: List[str]) -> Tuple[np.ndarray, ...]:
+    """
+    Get indicator values at the precision they were computed in.
+    
+    The indicator modules store their columns in INDICATOR_DTYPE but keep
+    the float64 values in df.attrs; those are used while they still match
+    df's rows, the stored columns otherwise.
+    
+    Args:
+        df: DataFrame with indicators
+        name: attrs key the indicator keeps its values under
+        columns: Columns to fall back to, in the same order
+        
+    Returns:
+        Tuple of arrays, one per column
+    """
+    values = _full_precision(df, name)
+    if values is None:
+        values = tuple(df[col].to_numpy() for col in columns)
+    return values
+
+
+@njit(nogil=True, cache=True)
+def _oscillator_features(
+    fast: np.ndarray,
+    slow: np.ndarray,
+    lower: float,
+    upper: float,
+    extreme_lower: float,
+    extreme_upper: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute momentum, spread, zone and crossover features of a two-line
+    oscillator in one pass.
+    
+    Float rows: fast momentum, slow momentum, spread, spread change.
+    Flag rows: fast < lower, fast > upper, fast < extreme_lower,
+    fast > extreme_upper, cross up, cross down. Comparisons involving NaN
+    are false, as with pandas.
+    
+    Args:
+        fast: Fast line (e.g., wt1, %K)
+        slow: Slow line (e.g., wt2, %D)
+        lower: Oversold level
+        upper: Overbought level
+        extreme_lower: Extreme oversold level
+        extreme_upper: Extreme overbought level
+        
+    Returns:
+        Tuple of (float64 array of shape (4, n), int8 array of shape (6, n))
+    """
+    n = fast.shape[0]
+    values = np.empty((4, n))
+    flags = np.zeros((6, n), dtype=np.int8)
+    
+    for i in range(n):
+        f = float(fast[i])
+        s = float(slow[i])
+        spread = f - s
+        values[2, i] = spread
+        
+        if i >= 1:
+            f_prev = float(fast[i - 1])
+            s_prev = float(slow[i - 1])
+            values[0, i] = f - f_prev
+            values[1, i] = s - s_prev
+            values[3, i] = spread - (f_prev - s_prev)
+            flags[4, i] = f > s and f_prev <= s_prev
+            flags[5, i] = f < s and f_prev >= s_prev
+        else:
+            values[0, i] = np.nan
+            values[1, i] = np.nan
+            values[3, i] = np.nan
+        
+        flags[0, i] = f < lower
+        flags[1, i] = f > upper
+        flags[2, i] = f < extreme_lower
+        flags[3, i] = f > extreme_upper
+    
+    return values, flags
+
 
 class FeatureEngineering:
     """Feature engineering for ML models."""
@@ -40,32 +223,17 @@ class FeatureEngineering:
         Returns:
             DataFrame with added price features
         """
-        df = df.copy()
-        
-        # Price changes
-        df['price_change'] = df['close'].pct_change()
-        df['price_change_2'] = df['close'].pct_change(periods=2)
-        df['price_change_5'] = df['close'].pct_change(periods=5)
-        
-        # High-Low range
-        df['hl_range'] = (df['high'] - df['low']) / df['close']
-        
-        # Close position in range
-        df['close_position'] = (df['close'] - df['low']) / (df['high'] - df['low'])
-        df['close_position'] = df['close_position'].fillna(0.5)
-        
-        # Gap from previous close
-        df['gap'] = (df['open'] - df['close'].shift(1)) / df['close'].shift(1)
-        
-        # Body size (candle body)
-        df['body_size'] = abs(df['close'] - df['open']) / df['close']
-        
-        # Upper/Lower shadows
-        df['upper_shadow'] = (df['high'] - df[['open', 'close']].max(axis=1)) / df['close']
-        df['lower_shadow'] = (df[['open', 'close']].min(axis=1) - df['low']) / df['close']
+        # Changes, range, gap, body and shadows in one compiled pass
+        block = _price_action_features(
+            df['open'].to_numpy(),
+            df['high'].to_numpy(),
+            df['low'].to_numpy(),
+            df['close'].to_numpy()
+        )
+        features = dict(zip(PRICE_ACTION_FEATURES, block))
         
         logger.debug("Added price features")
-        return df
+        return df.assign(**features)
     
     def add_volume_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -77,23 +245,25 @@ class FeatureEngineering:
         Returns:
             DataFrame with added volume features
         """
-        df = df.copy()
+        features = {}
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
         
         # Volume changes
-        df['volume_change'] = df['volume'].pct_change()
-        df['volume_ma_5'] = df['volume'].rolling(window=5).mean()
-        df['volume_ma_20'] = df['volume'].rolling(window=20).mean()
+        features['volume_change'] = _pct_change(volume)
+        volume_ma_5 = features['volume_ma_5'] = _rolling_mean(volume, 5)
+        volume_ma_20 = features['volume_ma_20'] = _rolling_mean(volume, 20)
         
         # Volume ratio to moving average
-        df['volume_ratio_5'] = df['volume'] / df['volume_ma_5']
-        df['volume_ratio_20'] = df['volume'] / df['volume_ma_20']
+        features['volume_ratio_5'] = volume / volume_ma_5
+        features['volume_ratio_20'] = volume / volume_ma_20
         
         # Volume-price correlation
-        df['vp_ratio'] = df['volume'] * df['close']
-        df['vp_ratio_change'] = df['vp_ratio'].pct_change()
+        vp_ratio = features['vp_ratio'] = volume * close
+        features['vp_ratio_change'] = _pct_change(vp_ratio)
         
         logger.debug("Added volume features")
-        return df
+        return df.assign(**features)
     
     def add_moving_average_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -105,28 +275,30 @@ class FeatureEngineering:
         Returns:
             DataFrame with MA features
         """
-        df = df.copy()
+        features = {}
+        close = df['close'].to_numpy(dtype=np.float64)
         
         # Simple Moving Averages
-        df['sma_7'] = df['close'].rolling(window=7).mean()
-        df['sma_25'] = df['close'].rolling(window=25).mean()
-        df['sma_99'] = df['close'].rolling(window=99).mean()
+        sma_7 = features['sma_7'] = _rolling_mean(close, 7)
+        sma_25 = features['sma_25'] = _rolling_mean(close, 25)
+        features['sma_99'] = _rolling_mean(close, 99)
         
         # Exponential Moving Averages
-        df['ema_12'] = df['close'].ewm(span=12, adjust=False).mean()
-        df['ema_26'] = df['close'].ewm(span=26, adjust=False).mean()
+        ema_12 = features['ema_12'] = _ema_span(close, 12)
+        ema_26 = features['ema_26'] = _ema_span(close, 26)
         
         # Distance from moving averages
-        df['distance_sma_7'] = (df['close'] - df['sma_7']) / df['close']
-        df['distance_sma_25'] = (df['close'] - df['sma_25']) / df['close']
-        df['distance_ema_12'] = (df['close'] - df['ema_12']) / df['close']
+        inv_close = np.reciprocal(close)
+        features['distance_sma_7'] = (close - sma_7) * inv_close
+        features['distance_sma_25'] = (close - sma_25) * inv_close
+        features['distance_ema_12'] = (close - ema_12) * inv_close
         
         # MA crossovers
-        df['ma_cross_7_25'] = (df['sma_7'] > df['sma_25']).astype(int)
-        df['ma_cross_12_26'] = (df['ema_12'] > df['ema_26']).astype(int)
+        features['ma_cross_7_25'] = (sma_7 > sma_25).astype(np.int8)
+        features['ma_cross_12_26'] = (ema_12 > ema_26).astype(np.int8)
         
         logger.debug("Added moving average features")
-        return df
+        return df.assign(**features)
     
     def add_wavetrend_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -138,28 +310,23 @@ class FeatureEngineering:
         Returns:
             DataFrame with WaveTrend features
         """
-        df = df.copy()
-        
-        # WaveTrend momentum
-        df['wt1_momentum'] = df['wt1'].diff()
-        df['wt2_momentum'] = df['wt2'].diff()
-        
-        # WaveTrend spread
-        df['wt_spread'] = df['wt1'] - df['wt2']
-        df['wt_spread_change'] = df['wt_spread'].diff()
-        
-        # WaveTrend zones
-        df['wt_oversold'] = (df['wt1'] < -60).astype(int)
-        df['wt_overbought'] = (df['wt1'] > 60).astype(int)
-        df['wt_extreme_oversold'] = (df['wt1'] < -80).astype(int)
-        df['wt_extreme_overbought'] = (df['wt1'] > 80).astype(int)
-        
-        # WaveTrend crossover signals
-        df['wt_cross_up'] = ((df['wt1'] > df['wt2']) & (df['wt1'].shift(1) <= df['wt2'].shift(1))).astype(int)
-        df['wt_cross_down'] = ((df['wt1'] < df['wt2']) & (df['wt1'].shift(1) >= df['wt2'].shift(1))).astype(int)
+        # Momentum, spread, zones and crossovers in one compiled pass
+        wt1, wt2 = _indicator_values(df, 'wavetrend', ['wt1', 'wt2'])
+        values, flags = _oscillator_features(wt1, wt2, -60, 60, -80, 80)
         
         logger.debug("Added WaveTrend features")
-        return df
+        return df.assign(
+            wt1_momentum=values[0],
+            wt2_momentum=values[1],
+            wt_spread=values[2],
+            wt_spread_change=values[3],
+            wt_oversold=flags[0],
+            wt_overbought=flags[1],
+            wt_extreme_oversold=flags[2],
+            wt_extreme_overbought=flags[3],
+            wt_cross_up=flags[4],
+            wt_cross_down=flags[5]
+        )
     
     def add_mfi_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -171,22 +338,23 @@ class FeatureEngineering:
         Returns:
             DataFrame with MFI features
         """
-        df = df.copy()
+        mfi, = _indicator_values(df, 'mfi', ['mfi'])
         
-        # MFI momentum
-        df['mfi_momentum'] = df['mfi'].diff()
-        df['mfi_acceleration'] = df['mfi_momentum'].diff()
-        
-        # MFI zones
-        df['mfi_oversold'] = (df['mfi'] < 20).astype(int)
-        df['mfi_overbought'] = (df['mfi'] > 80).astype(int)
+        # MFI momentum and zones in one compiled pass
+        values, flags = _oscillator_features(mfi, mfi, 20, 80, 20, 80)
         
         # MFI moving average
-        df['mfi_ma_5'] = df['mfi'].rolling(window=5).mean()
-        df['mfi_distance'] = df['mfi'] - df['mfi_ma_5']
+        mfi_ma_5 = _rolling_mean(mfi.astype(np.float64, copy=False), 5)
         
         logger.debug("Added MFI features")
-        return df
+        return df.assign(
+            mfi_momentum=values[0],
+            mfi_acceleration=np.diff(values[0], prepend=np.nan),
+            mfi_oversold=flags[0],
+            mfi_overbought=flags[1],
+            mfi_ma_5=mfi_ma_5,
+            mfi_distance=mfi - mfi_ma_5
+        )
     
     def add_rsi_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -198,22 +366,25 @@ class FeatureEngineering:
         Returns:
             DataFrame with RSI features
         """
-        df = df.copy()
-        
-        # RSI momentum
-        df['rsi_momentum'] = df['rsi'].diff()
-        
-        # RSI zones
-        df['rsi_oversold'] = (df['rsi'] < 30).astype(int)
-        df['rsi_overbought'] = (df['rsi'] > 70).astype(int)
+        # RSI momentum and zones (paired with itself, so its spread and
+        # crossover rows are unused)
+        rsi = df['rsi'].to_numpy()
+        rsi_values, rsi_flags = _oscillator_features(rsi, rsi, 30, 70, 30, 70)
         
-        # StochRSI features
-        df['stoch_spread'] = df['stoch_k'] - df['stoch_d']
-        df['stoch_cross_up'] = ((df['stoch_k'] > df['stoch_d']) & (df['stoch_k'].shift(1) <= df['stoch_d'].shift(1))).astype(int)
-        df['stoch_cross_down'] = ((df['stoch_k'] < df['stoch_d']) & (df['stoch_k'].shift(1) >= df['stoch_d'].shift(1))).astype(int)
+        # StochRSI spread and crossovers (on the float64 %K and %D, where
+        # flat stretches do not round them into ties)
+        stoch_k, stoch_d = _indicator_values(df, 'stoch_rsi', ['stoch_k', 'stoch_d'])
+        stoch_values, stoch_flags = _oscillator_features(stoch_k, stoch_d, 20, 80, 20, 80)
         
         logger.debug("Added RSI features")
-        return df
+        return df.assign(
+            rsi_momentum=rsi_values[0],
+            rsi_oversold=rsi_flags[0],
+            rsi_overbought=rsi_flags[1],
+            stoch_spread=stoch_values[2],
+            stoch_cross_up=stoch_flags[4],
+            stoch_cross_down=stoch_flags[5]
+        )
     
     def create_target_variable(
         self,
@@ -234,22 +405,25 @@ class FeatureEngineering:
         Returns:
             DataFrame with target variable
         """
-        df = df.copy()
-        
         # Calculate future price change
-        df['future_price'] = df['close'].shift(-lookahead)
-        df['future_return'] = (df['future_price'] - df['close']) / df['close']
+        future_price = df['close'].shift(-lookahead)
+        future_return = (future_price - df['close']) / df['close']
         
         # Binary target: 1 if price increases by threshold, 0 otherwise
-        df['target'] = (df['future_return'] > threshold).astype(int)
+        ret = future_return.to_numpy()
+        up = ret > threshold
+        down = ret < -threshold
         
-        # Multi-class target (optional)
-        df['target_multi'] = 0  # Neutral
-        df.loc[df['future_return'] > threshold, 'target_multi'] = 1  # Buy
-        df.loc[df['future_return'] < -threshold, 'target_multi'] = -1  # Sell
+        # Multi-class target (optional): 1 buy, -1 sell, 0 neutral
+        target_multi = np.where(up, np.int8(1), np.where(down, np.int8(-1), np.int8(0)))
         
         logger.debug(f"Created target variable (lookahead={lookahead}, threshold={threshold})")
-        return df
+        return df.assign(
+            future_price=future_price,
+            future_return=future_return,
+            target=up.astype(np.int8),
+            target_multi=target_multi
+        )
     
     def engineer_all_features(
         self,
@@ -295,10 +469,48 @@ class FeatureEngineering:
         # Store feature column names
         self.feature_columns = self.get_feature_columns(df)
         
+        # Narrow float features to the storage dtype
+        df = df.astype({
+            col: FEATURE_DTYPE for col in self.feature_columns
+            if df[col].dtype.kind == 'f'
+        })
+        
         logger.info(f"✅ Feature engineering completed: {len(self.feature_columns)} features")
         
         return df
     
+    def engineer_batch(
+        self,
+        dfs: Dict[str, pd.DataFrame],
+        include_indicators: bool = True,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Apply all feature engineering steps to several symbols concurrently.
+        
+        Runs on a thread pool: the compiled feature and moving-average
+        kernels release the GIL, as do most NumPy operations, so symbols
+        overlap without pickling frames to worker processes.
+        
+        Args:
+            dfs: Dictionary mapping symbols to DataFrames with OHLCV data
+            include_indicators: Whether to calculate indicators (if not already present)
+            max_workers: Maximum number of threads (CPU count if None)
+            
+        Returns:
+            Dictionary mapping symbols to DataFrames with all features
+        """
+        workers = min(len(dfs), max_workers or os.cpu_count() or 1)
+        
+        def engineer(df: pd.DataFrame) -> pd.DataFrame:
+            return self.engineer_all_features(df, include_indicators)
+        
+        if workers <= 1:
+            return {symbol: engineer(df) for symbol, df in dfs.items()}
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(dfs, executor.map(engineer, dfs.values())))
+    
     def get_feature_columns(self, df: pd.DataFrame) -> List[str]:
         """
         Get list of feature column names (excluding OHLCV and target).
@@ -334,7 +546,22 @@ class FeatureEngineering:
             Tuple of (features DataFrame, target Series)
         """
         if drop_na:
-            df = df.dropna()
+            # Only float features can hold NaN (flags are int8), and the
+            # target is undefined wherever future_return is NaN
+            valid = np.ones(len(df), dtype=bool)
+            for col in self.feature_columns + ['future_return']:
+                values = df[col].to_numpy()
+                if values.dtype.kind == 'f':
+                    valid &= ~np.isnan(values)
+            
+            # NaNs normally sit only in the indicator warm-up and the last
+            # lookahead rows, so the valid rows form one run that can be
+            # sliced instead of gathered row by row
+            rows = np.flatnonzero(valid)
+            if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+                df = df.iloc[rows[0]:rows[-1] + 1]
+            else:
+                df = df[valid]
         
         X = df[self.feature_columns]
         y = df['target']
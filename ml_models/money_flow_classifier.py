@@ -11,9 +11,10 @@ from typing import Tuple, Optional, Dict
 import joblib
 from pathlib import Path
 
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
+from sklearn.inspection import permutation_importance
 from sklearn.preprocessing import StandardScaler
 
 from utils.logger import get_logger
@@ -22,12 +23,27 @@ from ml_models.feature_engineering import FeatureEngineering
 
 logger = get_logger('ml_models')
 
+# Saved models are lz4-compressed (much faster than the default zlib); without
+# lz4 installed they fall back to zlib, which joblib always supports
+try:
+    import lz4
+    MODEL_COMPRESSION = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESSION = ('zlib', 3)
+
+# joblib writes numpy arrays with its own pickler, so the protocol only
+# affects the rest of the object graph (the estimators' Python attributes)
+MODEL_PICKLE_PROTOCOL = 5
+
+# Tree ensembles are invariant to feature scaling, so these skip the scaler
+TREE_MODEL_TYPES = ('random_forest', 'gradient_boosting')
+
 
 class MoneyFlowClassifier:
     """
     ML model for predicting money flow direction.
     
-    Uses RandomForest and GradientBoosting ensemble.
+    Uses RandomForest or histogram-based GradientBoosting ensembles.
     """
     
     def __init__(self, model_type: str = 'random_forest'):
@@ -39,10 +55,14 @@ class MoneyFlowClassifier:
         """
         self.model_type = model_type
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None if model_type in TREE_MODEL_TYPES else StandardScaler(copy=False)
         self.feature_names = []
+        self.categorical_features = []
         self.is_trained = False
         
+        # Column labels for estimators fitted on a DataFrame (see _label_features)
+        self._feature_index = None
+        
         # Get model parameters from config
         config = get_config()
         params = config.get_ml_params('money_flow_classifier')
@@ -57,8 +77,9 @@ class MoneyFlowClassifier:
                 n_jobs=-1
             )
         elif model_type == 'gradient_boosting':
-            self.model = GradientBoostingClassifier(
-                n_estimators=params.get('n_estimators', 100),
+            # Histogram-based boosting: features binned to uint8, multithreaded
+            self.model = HistGradientBoostingClassifier(
+                max_iter=params.get('n_estimators', 100),
                 max_depth=params.get('max_depth', 5),
                 learning_rate=params.get('learning_rate', 0.1),
                 random_state=42
@@ -72,10 +93,13 @@ class MoneyFlowClassifier:
         self,
         df: pd.DataFrame,
         test_size: float = 0.2
-    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+    ) -> Tuple[np.ndarray, np.ndarray, pd.Series, pd.Series]:
         """
         Prepare data for training.
         
+        Features are returned as float32 arrays whose columns follow
+        self.feature_names, standardized unless the model is a tree ensemble.
+        
         Args:
             df: DataFrame with features and target
             test_size: Proportion of data for testing
@@ -92,18 +116,27 @@ class MoneyFlowClassifier:
         X, y = fe.prepare_ml_data(df, drop_na=True)
         self.feature_names = X.columns.tolist()
         
+        # Integer feature columns are the 0/1 zone and crossover flags;
+        # histogram boosting splits them as categories rather than binning
+        self.categorical_features = [
+            col for col in self.feature_names if X[col].dtype.kind == 'i'
+        ]
+        if isinstance(self.model, HistGradientBoostingClassifier):
+            categorical = set(self.categorical_features)
+            self.model.set_params(
+                categorical_features=[col in categorical for col in self.feature_names]
+            )
+        
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=42, stratify=y
+            X.to_numpy(dtype=np.float32), y,
+            test_size=test_size, random_state=42, stratify=y
         )
         
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        
-        # Convert back to DataFrame
-        X_train = pd.DataFrame(X_train_scaled, columns=self.feature_names)
-        X_test = pd.DataFrame(X_test_scaled, columns=self.feature_names)
+        # Scale features in place (the split arrays are already copies)
+        if self.scaler is not None:
+            self.scaler.fit_transform(X_train)
+            self.scaler.transform(X_test)
         
         logger.info(f"📊 Data prepared: {len(X_train)} train, {len(X_test)} test samples")
         
@@ -111,7 +144,7 @@ class MoneyFlowClassifier:
     
     def train(
         self,
-        X_train: pd.DataFrame,
+        X_train: np.ndarray,
         y_train: pd.Series,
         cv_folds: int = 5
     ) -> Dict:
@@ -131,10 +164,13 @@ class MoneyFlowClassifier:
         # Train model
         self.model.fit(X_train, y_train)
         
-        # Cross-validation
+        # Cross-validation; folds run in parallel only when the estimator
+        # is single-threaded, since nesting its own thread pool in parallel
+        # folds would oversubscribe the cores
         cv_scores = cross_val_score(
             self.model, X_train, y_train,
-            cv=cv_folds, scoring='roc_auc'
+            cv=cv_folds, scoring='roc_auc',
+            n_jobs=-1 if self._single_threaded() else None
         )
         
         # Training metrics
@@ -156,9 +192,23 @@ class MoneyFlowClassifier:
         
         return metrics
     
+    def _single_threaded(self) -> bool:
+        """
+        Check whether the model trains on a single thread.
+        
+        RandomForest with n_jobs != 1 builds trees in parallel and
+        HistGradientBoosting always uses OpenMP threads.
+        
+        Returns:
+            True if fitting the model keeps one core busy
+        """
+        if isinstance(self.model, HistGradientBoostingClassifier):
+            return False
+        return self.model.get_params().get('n_jobs') in (None, 1)
+    
     def evaluate(
         self,
-        X_test: pd.DataFrame,
+        X_test: np.ndarray,
         y_test: pd.Series
     ) -> Dict:
         """
@@ -212,7 +262,7 @@ class MoneyFlowClassifier:
         Make predictions.
         
         Args:
-            X: Features DataFrame
+            X: Features (DataFrame or array with columns in feature_names order)
             
         Returns:
             Array of predictions (0 or 1)
@@ -220,17 +270,14 @@ class MoneyFlowClassifier:
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
         
-        # Scale features
-        X_scaled = self.scaler.transform(X)
-        
-        return self.model.predict(X_scaled)
+        return self.model.predict(self._scale_features(X))
     
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
         """
         Predict probabilities.
         
         Args:
-            X: Features DataFrame
+            X: Features (DataFrame or array with columns in feature_names order)
             
         Returns:
             Array of probabilities for class 1
@@ -238,17 +285,62 @@ class MoneyFlowClassifier:
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
         
-        # Scale features
-        X_scaled = self.scaler.transform(X)
+        return self.model.predict_proba(self._scale_features(X))[:, 1]
+    
+    def _scale_features(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Convert features to an array, scaled if the model uses a scaler.
+        
+        Args:
+            X: Features (DataFrame or array with columns in feature_names order)
+            
+        Returns:
+            Feature array (a scaled copy; the input is never modified),
+            labelled if the model was fitted on a DataFrame
+        """
+        X = np.asarray(X)
+        if self.scaler is not None:
+            X = self.scaler.transform(self._label_features(X, self.scaler), copy=True)
+        return self._label_features(X, self.model)
+    
+    def _label_features(self, X: np.ndarray, estimator) -> np.ndarray:
+        """
+        Wrap a feature array in a DataFrame if the estimator expects names.
         
-        return self.model.predict_proba(X_scaled)[:, 1]
+        Estimators fitted on a DataFrame (such as the bundled model) warn on
+        every call given a bare array. The column Index is built once and
+        reused, and the DataFrame wraps the array without copying it.
+        
+        Args:
+            X: Feature array with columns in feature_names order
+            estimator: Fitted scaler or model X is passed to
+            
+        Returns:
+            X itself, or a DataFrame view of it labelled with the fitted names
+        """
+        if not hasattr(estimator, 'feature_names_in_'):
+            return X
+        if self._feature_index is None:
+            self._feature_index = pd.Index(estimator.feature_names_in_)
+        return pd.DataFrame(X, columns=self._feature_index, copy=False)
     
-    def get_feature_importance(self, top_n: int = 20) -> pd.DataFrame:
+    def get_feature_importance(
+        self,
+        top_n: int = 20,
+        X_test: Optional[np.ndarray] = None,
+        y_test: Optional[pd.Series] = None
+    ) -> pd.DataFrame:
         """
         Get feature importance.
         
+        HistGradientBoosting has no impurity-based importances, so for it
+        the importance is the mean drop in test ROC-AUC when a feature is
+        shuffled (permutation importance), which needs held-out data.
+        
         Args:
             top_n: Number of top features to return
+            X_test: Held-out features (required without feature_importances_)
+            y_test: Held-out target (required without feature_importances_)
             
         Returns:
             DataFrame with feature importance
@@ -256,7 +348,18 @@ class MoneyFlowClassifier:
         if not self.is_trained:
             raise ValueError("Model must be trained first")
         
-        importance = self.model.feature_importances_
+        if hasattr(self.model, 'feature_importances_'):
+            importance = self.model.feature_importances_
+        elif X_test is not None and y_test is not None:
+            result = permutation_importance(
+                self.model, X_test, y_test,
+                scoring='roc_auc', n_repeats=5, random_state=42
+            )
+            importance = result.importances_mean
+        else:
+            raise ValueError(
+                f"Feature importance for {self.model_type} needs X_test and y_test"
+            )
         
         importance_df = pd.DataFrame({
             'feature': self.feature_names,
@@ -282,11 +385,15 @@ class MoneyFlowClassifier:
             'model': self.model,
             'scaler': self.scaler,
             'feature_names': self.feature_names,
+            'categorical_features': self.categorical_features,
             'model_type': self.model_type
         }
         
-        joblib.dump(model_data, save_path)
-        logger.info(f"💾 Model saved to {save_path}")
+        joblib.dump(
+            model_data, save_path,
+            compress=MODEL_COMPRESSION, protocol=MODEL_PICKLE_PROTOCOL
+        )
+        logger.info(f"💾 Model saved to {save_path} ({MODEL_COMPRESSION[0]})")
     
     def load(self, path: str):
         """
@@ -298,9 +405,11 @@ class MoneyFlowClassifier:
         model_data = joblib.load(path)
         
         self.model = model_data['model']
-        self.scaler = model_data['scaler']
+        self.scaler = model_data.get('scaler')
         self.feature_names = model_data['feature_names']
+        self.categorical_features = model_data.get('categorical_features', [])
         self.model_type = model_data['model_type']
+        self._feature_index = None
         self.is_trained = True
         
         logger.info(f"📂 Model loaded from {path}")
@@ -358,13 +467,13 @@ if __name__ == '__main__':
     
     # Feature importance
     print("\n📊 Top 10 Most Important Features:")
-    importance = classifier.get_feature_importance(top_n=10)
+    importance = classifier.get_feature_importance(top_n=10, X_test=X_test, y_test=y_test)
     for idx, row in importance.iterrows():
         print(f"   {row['feature']:<25} {row['importance']:.4f}")
     
     # Test prediction on latest data
     print("\n🔮 Testing prediction on latest data...")
-    latest_features = X_test.tail(5)
+    latest_features = X_test[-5:]
     predictions = classifier.predict(latest_features)
     probabilities = classifier.predict_proba(latest_features)
     
@@ -9,31 +9,252 @@ Scans multiple cryptocurrencies across different timeframes using:
 Provides aggregated signals and scoring.
 """
 
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from utils.logger import get_scanner_logger
 from utils.config import get_config, get_top_symbols, get_active_timeframes
-from data_collection.binance_client import BinanceClient
+from data_collection.binance_client import BinanceClient, get_client
 from indicators.wavetrend import add_wavetrend
 from indicators.money_flow import add_money_flow
 from indicators.rsi import add_rsi, add_stochastic_rsi
 
 logger = get_scanner_logger()
 
+# Most scan results kept in memory (least recently used are evicted first)
+SCAN_CACHE_SIZE = 512
+
+# Seconds a scan is served from memory. Scans include the still-forming
+# candle, so this bounds how stale its price can be
+SCAN_CACHE_TTL = 5
+
+# Signal score components: (buy column, sell column, value column, oversold
+# level, overbought level, signal weight, zone weight)
+SCORE_COMPONENTS = [
+    ('wt_buy', 'wt_sell', 'wt1', -60, 60, 2, 1),
+    ('mfi_buy', 'mfi_sell', 'mfi', 20, 80, 1, 0.5),
+    ('rsi_buy', 'rsi_sell', 'rsi', 30, 70, 1, 0.5),
+    ('stoch_buy', 'stoch_sell', 'stoch_k', 20, 80, 1, 0.5),
+]
+
+# Score edges between signal types and the type of each band. Scores on an
+# edge belong to the stronger signal: >= 1.5 is BUY, <= -1.5 is SELL.
+SIGNAL_EDGES = np.array([-3.0, -1.5, 1.5, 3.0])
+SIGNAL_TYPES = np.array(['STRONG SELL', 'SELL', 'NEUTRAL', 'BUY', 'STRONG BUY'])
+
+# Candles in the synthetic frame warm_up runs the indicators on
+WARM_UP_CANDLES = 64
+
+# Indicator columns reported per symbol by scan_multiple_symbols, after
+# symbol, timestamp, price, signal_score and signal_type
+RESULT_COLUMNS = ['wt1', 'wt2', 'mfi', 'rsi', 'stoch_k', 'stoch_d', 'wt_buy', 'wt_sell', 'volume']
+
+
+def apply_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add all scanner indicators to an OHLCV DataFrame.
+    
+    Args:
+        df: DataFrame with OHLCV data
+        
+    Returns:
+        DataFrame with all indicators calculated
+    """
+    df = add_wavetrend(df)
+    df = add_money_flow(df)
+    df = add_rsi(df)
+    df = add_stochastic_rsi(df)
+    return df
+
+
+def score_bands(scores: np.ndarray) -> np.ndarray:
+    """
+    Map signal scores to the index of their signal type in SIGNAL_TYPES.
+    
+    Args:
+        scores: Array of signal scores
+        
+    Returns:
+        Array of band indices (0 = STRONG SELL ... 4 = STRONG BUY)
+    """
+    # Edges count towards the band away from zero on both sides
+    return np.where(
+        scores >= 0,
+        np.searchsorted(SIGNAL_EDGES, scores, side='right'),
+        np.searchsorted(SIGNAL_EDGES, scores, side='left')
+    )
+
+
+def classify_scores(scores: np.ndarray) -> np.ndarray:
+    """
+    Map signal scores to signal types.
+    
+    Args:
+        scores: Array of signal scores
+        
+    Returns:
+        Array of signal type strings (see SIGNAL_TYPES)
+    """
+    return SIGNAL_TYPES[score_bands(scores)]
+
+
+def warm_up() -> None:
+    """
+    Run apply_indicators once on synthetic candles.
+    
+    The numba kernels are cached on disk, but each process still loads
+    them (or, with a cold cache, compiles them) on first use, including the
+    per-period RSI and StochRSI specialisations. Calling this ahead of time
+    keeps that cost out of the first real scan. Runs at import when
+    SIGNALCIPHER_WARM is set.
+    """
+    t = np.arange(WARM_UP_CANDLES, dtype=np.float64)
+    close = 100.0 + np.sin(t / 4.0)
+    ohlcv = np.column_stack([t * 60_000, close, close + 1.0, close - 1.0, close, np.full_like(t, 1000.0)])
+    apply_indicators(BinanceClient._to_dataframe(ohlcv))
+
+
+if os.getenv('SIGNALCIPHER_WARM', 'False').lower() in ('1', 'true'):
+    warm_up()
+
 
 class MarketScanner:
     """
     Scanner for analyzing multiple cryptocurrencies with all indicators.
     """
     
-    def __init__(self):
-        """Initialize market scanner."""
+    def __init__(self, client: Optional[BinanceClient] = None):
+        """
+        Initialize market scanner.
+        
+        Args:
+            client: Binance client (the shared one from get_client if None)
+        """
         self.config = get_config()
-        self.client = BinanceClient()
+        self.client = client if client is not None else get_client()
+        
+        # Recent scans keyed by (symbol, timeframe, limit); an entry is only
+        # served within the candle it was taken in and within scan_ttl, so
+        # the still-forming candle is never more than scan_ttl seconds stale
+        cache = self.config.get_performance_params().get('cache', {})
+        self._scan_cache_ttl = cache.get('scan_ttl', SCAN_CACHE_TTL) if cache.get('enabled', True) else 0
+        self._scan_cache = OrderedDict()
+        self._scan_cache_lock = threading.Lock()
+        
         logger.info("✅ Market Scanner initialized")
     
+    def _current_bar(self, timeframe: str) -> int:
+        """
+        Number of the candle currently forming on a timeframe.
+        
+        Args:
+            timeframe: Timeframe (e.g., '1h')
+            
+        Returns:
+            Index of the current candle since the Unix epoch
+        """
+        return int(time.time() // self.client.exchange.parse_timeframe(timeframe))
+    
+    def _get_cached_scan(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int
+    ) -> Optional[pd.DataFrame]:
+        """
+        Look up a scan taken during the current candle and within the TTL.
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe
+            limit: Number of candles
+            
+        Returns:
+            DataFrame with all indicators, or None if there is no fresh scan
+        """
+        if not self._scan_cache_ttl:
+            return None
+        
+        key = (symbol, timeframe, limit)
+        bar = self._current_bar(timeframe)
+        with self._scan_cache_lock:
+            entry = self._scan_cache.get(key)
+            if entry is None:
+                return None
+            
+            entry_bar, stored_at, df = entry
+            if entry_bar != bar or time.monotonic() - stored_at > self._scan_cache_ttl:
+                del self._scan_cache[key]
+                return None
+            
+            self._scan_cache.move_to_end(key)
+        
+        # Copy-on-write: changes made by the caller never reach the cache
+        return df.copy(deep=False)
+    
+    def _store_scan(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        df: pd.DataFrame
+    ):
+        """
+        Remember a scan for later calls within the same candle.
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe
+            limit: Number of candles
+            df: DataFrame with all indicators (empty results are not stored)
+        """
+        if not self._scan_cache_ttl or df.empty:
+            return
+        
+        key = (symbol, timeframe, limit)
+        entry = (self._current_bar(timeframe), time.monotonic(), df.copy(deep=False))
+        with self._scan_cache_lock:
+            self._scan_cache[key] = entry
+            self._scan_cache.move_to_end(key)
+            while len(self._scan_cache) > SCAN_CACHE_SIZE:
+                self._scan_cache.popitem(last=False)
+    
+    def _apply_indicators_many(
+        self,
+        frames: Dict[Tuple[str, str], pd.DataFrame]
+    ) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """
+        Add all scanner indicators to several OHLCV DataFrames.
+        
+        A failure on one frame is logged and drops only that frame, so one
+        bad symbol or timeframe never costs the rest of a batch. Runs
+        sequentially: a scanner-sized frame takes about 2ms, less than
+        starting worker processes and pickling frames to them costs, and
+        forking after the parallel numba kernels have started their
+        threading layer is not safe.
+        
+        Args:
+            frames: DataFrames with OHLCV data keyed by (symbol, timeframe)
+            
+        Returns:
+            DataFrames with all indicators calculated, for the frames that
+            succeeded, in input order
+        """
+        results = {}
+        for (symbol, timeframe), df in frames.items():
+            try:
+                results[symbol, timeframe] = apply_indicators(df)
+            except Exception as e:
+                logger.error(f"Error scanning {symbol} {timeframe}: {e}")
+        return results
+    
     def scan_symbol(
         self,
         symbol: str,
@@ -43,6 +264,9 @@ class MarketScanner:
         """
         Scan a single symbol with all indicators.
         
+        Repeated scans within the same candle are served from memory (see
+        _get_cached_scan).
+        
         Args:
             symbol: Trading pair (e.g., 'BTC/USDT')
             timeframe: Timeframe to analyze
@@ -52,6 +276,11 @@ class MarketScanner:
             DataFrame with all indicators calculated
         """
         try:
+            cached = self._get_cached_scan(symbol, timeframe, limit)
+            if cached is not None:
+                logger.debug(f"♻️ Using cached scan of {symbol} {timeframe}")
+                return cached
+            
             logger.info(f"🔍 Scanning {symbol} {timeframe}...")
             
             # Fetch data
@@ -62,10 +291,8 @@ class MarketScanner:
                 return df
             
             # Add all indicators
-            df = add_wavetrend(df)
-            df = add_money_flow(df)
-            df = add_rsi(df)
-            df = add_stochastic_rsi(df)
+            df = apply_indicators(df)
+            self._store_scan(symbol, timeframe, limit, df)
             
             logger.info(f"✅ {symbol} scan completed")
             
@@ -75,9 +302,48 @@ class MarketScanner:
             logger.error(f"Error scanning {symbol}: {e}")
             return pd.DataFrame()
     
-    def calculate_signal_score(self, row: pd.Series) -> Tuple[int, str]:
+    def scan_timeframes(
+        self,
+        symbol: str,
+        timeframes: Optional[List[str]] = None,
+        limit: int = 200
+    ) -> Dict[str, pd.DataFrame]:
         """
-        Calculate aggregated signal score from all indicators.
+        Scan a single symbol on several timeframes.
+        
+        All timeframes are fetched concurrently; indicators are then
+        computed frame by frame.
+        
+        Args:
+            symbol: Trading pair (e.g., 'BTC/USDT')
+            timeframes: Timeframes to analyze (uses config default if None)
+            limit: Number of candles to fetch per timeframe
+            
+        Returns:
+            Dictionary mapping timeframes to DataFrames with all indicators
+        """
+        if timeframes is None:
+            timeframes = get_active_timeframes()
+        
+        logger.info(f"🔍 Scanning {symbol} on {len(timeframes)} timeframes...")
+        
+        frames = self.client.fetch_multiple_timeframes(symbol, timeframes, limit)
+        analyzed = self._apply_indicators_many({
+            (symbol, tf): frames[tf] for tf in timeframes if not frames[tf].empty
+        })
+        
+        # Timeframes without data or whose indicators failed come back empty
+        results = {
+            tf: analyzed.get((symbol, tf), pd.DataFrame()) for tf in timeframes
+        }
+        
+        logger.info(f"✅ {symbol} scanned on {len(analyzed)} timeframes")
+        
+        return results
+    
+    def score_frame(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate aggregated signal scores for every row of a DataFrame.
         
         Score ranges from -5 (strong sell) to +5 (strong buy):
         - WaveTrend: -2 to +2
@@ -85,67 +351,47 @@ class MarketScanner:
         - RSI: -1 to +1
         - StochRSI: -1 to +1
         
+        Each indicator contributes its signal weight on a buy/sell signal,
+        otherwise half of it (one point for WaveTrend) while oversold or
+        overbought. Missing signal columns count as no signal.
+        
+        Args:
+            df: DataFrame with indicator values
+            
+        Returns:
+            Tuple of (score array, signal type array)
+        """
+        n = len(df)
+        score = np.zeros(n)
+        
+        for buy_col, sell_col, value_col, low, high, weight, zone_weight in SCORE_COMPONENTS:
+            buy = df[buy_col].to_numpy(dtype=bool) if buy_col in df else np.zeros(n, dtype=bool)
+            sell = df[sell_col].to_numpy(dtype=bool) if sell_col in df else np.zeros(n, dtype=bool)
+            value = df[value_col].to_numpy(dtype=np.float64)
+            
+            # First matching condition wins, as in an if/elif chain
+            score += np.select(
+                [buy, sell, value < low, value > high],
+                [weight, -weight, zone_weight, -zone_weight],
+                0.0
+            )
+        
+        return score, classify_scores(score)
+    
+    def calculate_signal_score(self, row: pd.Series) -> Tuple[float, str]:
+        """
+        Calculate aggregated signal score from all indicators.
+        
+        Single-row form of score_frame.
+        
         Args:
             row: DataFrame row with indicator values
             
         Returns:
             Tuple of (score, signal_type)
         """
-        score = 0
-        
-        # WaveTrend signals (weight: 2)
-        if row.get('wt_buy', False):
-            score += 2
-        elif row.get('wt_sell', False):
-            score -= 2
-        elif row['wt1'] < -60:  # Oversold
-            score += 1
-        elif row['wt1'] > 60:  # Overbought
-            score -= 1
-        
-        # MFI signals (weight: 1)
-        if row.get('mfi_buy', False):
-            score += 1
-        elif row.get('mfi_sell', False):
-            score -= 1
-        elif row['mfi'] < 20:  # Oversold
-            score += 0.5
-        elif row['mfi'] > 80:  # Overbought
-            score -= 0.5
-        
-        # RSI signals (weight: 1)
-        if row.get('rsi_buy', False):
-            score += 1
-        elif row.get('rsi_sell', False):
-            score -= 1
-        elif row['rsi'] < 30:  # Oversold
-            score += 0.5
-        elif row['rsi'] > 70:  # Overbought
-            score -= 0.5
-        
-        # StochRSI signals (weight: 1)
-        if row.get('stoch_buy', False):
-            score += 1
-        elif row.get('stoch_sell', False):
-            score -= 1
-        elif row['stoch_k'] < 20:  # Oversold
-            score += 0.5
-        elif row['stoch_k'] > 80:  # Overbought
-            score -= 0.5
-        
-        # Determine signal type
-        if score >= 3:
-            signal_type = "STRONG BUY"
-        elif score >= 1.5:
-            signal_type = "BUY"
-        elif score <= -3:
-            signal_type = "STRONG SELL"
-        elif score <= -1.5:
-            signal_type = "SELL"
-        else:
-            signal_type = "NEUTRAL"
-        
-        return score, signal_type
+        score, signal_type = self.score_frame(row.to_frame().T)
+        return score[0].item(), str(signal_type[0])
     
     def get_latest_signals(self, df: pd.DataFrame, symbol: str) -> Dict:
         """
@@ -162,7 +408,8 @@ class MarketScanner:
             return {}
         
         latest = df.iloc[-1]
-        score, signal_type = self.calculate_signal_score(latest)
+        scores, signal_types = self.score_frame(df.iloc[-1:])
+        score, signal_type = scores[0].item(), str(signal_types[0])
         
         return {
             'symbol': symbol,
@@ -181,6 +428,45 @@ class MarketScanner:
             'volume': latest['volume']
         }
     
+    def scan_symbols(
+        self,
+        symbols: List[str],
+        timeframe: str = '1h',
+        limit: int = 200
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Scan several symbols with all indicators.
+        
+        Symbols without a fresh cached scan are fetched in one batch of
+        concurrent requests on the client's shared async session (rate
+        limited by the client); indicators are then computed as in
+        scan_timeframes. A symbol that fails to fetch or whose indicators
+        raise is logged and left empty; the other symbols are unaffected.
+        
+        Args:
+            symbols: List of symbols
+            timeframe: Timeframe to analyze
+            limit: Number of candles per symbol
+            
+        Returns:
+            Dictionary mapping symbols to DataFrames with all indicators
+            (empty for symbols without data or that failed)
+        """
+        scans = {symbol: self._get_cached_scan(symbol, timeframe, limit) for symbol in symbols}
+        missing = [symbol for symbol, df in scans.items() if df is None]
+        
+        # Fetch the rest at once, then add indicators to those with data
+        frames = self.client.fetch_multiple_symbols(missing, timeframe, limit) if missing else {}
+        analyzed = self._apply_indicators_many({
+            (symbol, timeframe): frames[symbol] for symbol in missing if not frames[symbol].empty
+        })
+        for symbol in missing:
+            df = analyzed.get((symbol, timeframe), pd.DataFrame())
+            self._store_scan(symbol, timeframe, limit, df)
+            scans[symbol] = df
+        
+        return scans
+    
     def scan_multiple_symbols(
         self,
         symbols: Optional[List[str]] = None,
@@ -190,6 +476,8 @@ class MarketScanner:
         """
         Scan multiple symbols and return aggregated results.
         
+        Symbols are scanned together (see scan_symbols).
+        
         Args:
             symbols: List of symbols (uses config default if None)
             timeframe: Timeframe to analyze
@@ -203,31 +491,57 @@ class MarketScanner:
         
         logger.info(f"🔍 Scanning {len(symbols)} symbols on {timeframe} timeframe")
         
-        results = []
+        # Failures of single symbols are isolated by scan_symbols; this only
+        # catches the batch itself failing (e.g. the client shutting down)
+        try:
+            scans = self.scan_symbols(symbols, timeframe, limit)
+        except Exception as e:
+            logger.error(f"Error scanning symbols: {e}")
+            return pd.DataFrame()
         
-        for symbol in symbols:
-            try:
-                # Scan symbol
-                df = self.scan_symbol(symbol, timeframe, limit)
-                
-                if not df.empty:
-                    # Get latest signals
-                    signals = self.get_latest_signals(df, symbol)
-                    results.append(signals)
-                
-            except Exception as e:
-                logger.error(f"Failed to scan {symbol}: {e}")
-                continue
-        
-        # Create results DataFrame
-        if results:
-            results_df = pd.DataFrame(results)
-            results_df = results_df.sort_values('signal_score', ascending=False)
-            logger.info(f"✅ Scan completed: {len(results_df)} symbols analyzed")
-            return results_df
-        else:
+        scanned = [symbol for symbol in symbols if not scans[symbol].empty]
+        
+        if not scanned:
             logger.warning("No results from scan")
             return pd.DataFrame()
+        
+        try:
+            latest = self._latest_rows([scans[symbol] for symbol in scanned])
+        except Exception as e:
+            logger.error(f"Failed to collect scan results: {e}")
+            return pd.DataFrame()
+        
+        # Score every symbol in one pass
+        scores, signal_types = self.score_frame(latest)
+        
+        results_df = pd.DataFrame({
+            'symbol': scanned,
+            'timestamp': latest.index,
+            'price': latest['close'].to_numpy(),
+            'signal_score': scores,
+            'signal_type': signal_types.astype(object),
+            **{col: latest[col].to_numpy() if col in latest else False for col in RESULT_COLUMNS}
+        })
+        results_df = results_df.sort_values('signal_score', ascending=False)
+        logger.info(f"✅ Scan completed: {len(results_df)} symbols analyzed")
+        return results_df
+    
+    @staticmethod
+    def _latest_rows(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Collect the last row of each analyzed DataFrame into one DataFrame.
+        
+        The one-row tails are joined with a single concat, which keeps each
+        column's dtype; no per-symbol dicts or mixed-dtype row Series are
+        built. Columns missing from any of the frames are left out.
+        
+        Args:
+            frames: Non-empty DataFrames with indicators
+            
+        Returns:
+            DataFrame with one row per frame, indexed by timestamp
+        """
+        return pd.concat([df.iloc[-1:] for df in frames], join='inner')
     
     def find_opportunities(
         self,
@@ -260,6 +574,20 @@ class MarketScanner:
         return opportunities
 
 
+@lru_cache(maxsize=1)
+def get_scanner() -> MarketScanner:
+    """
+    Get the scanner shared by the whole process, creating it on first use.
+    
+    Its scan cache is then shared as well, so a symbol scanned by one user
+    is not fetched again by another within the same candle.
+    
+    Returns:
+        MarketScanner instance
+    """
+    return MarketScanner()
+
+
 if __name__ == '__main__':
     """Test market scanner."""
     print("=" * 70)
@@ -4,23 +4,84 @@ Real-time Signal Generator.
 Combines all indicators and ML model to generate trading signals in real-time.
 """
 
-import pandas as pd
-from typing import Dict, List, Optional
+import json
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
 
 from utils.logger import get_logger
 from utils.config import get_config, get_top_symbols
-from data_collection.binance_client import BinanceClient
-from scanner.market_scanner import MarketScanner
-from ml_models.money_flow_classifier import MoneyFlowClassifier
-from ml_models.feature_engineering import FeatureEngineering
+
+# pandas, the scanner and the ML stack are imported where first needed so
+# that importing this module stays cheap
+if TYPE_CHECKING:
+    import pandas as pd
+
+# orjson encodes datetimes and NumPy scalars natively and several times
+# faster than json; without it signals are encoded with json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = get_logger('signals')
 
+# Most ML predictions kept in memory (least recently used are evicted first)
+PREDICTION_CACHE_SIZE = 512
+
+# Indicators whose agreement raises confidence, with their oversold and
+# overbought levels in the same order
+AGREEMENT_INDICATORS = ['wt1', 'mfi', 'rsi', 'stoch_k']
+OVERSOLD_LEVELS = np.array([-60.0, 20.0, 30.0, 20.0])
+OVERBOUGHT_LEVELS = np.array([60.0, 80.0, 70.0, 80.0])
+
+
+def _json_default(value):
+    """
+    Encode the values json cannot handle itself (NumPy scalars, datetimes).
+    
+    Args:
+        value: Value to encode
+        
+    Returns:
+        JSON-compatible equivalent
+        
+    Raises:
+        TypeError: If the value has no JSON equivalent
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def signal_to_bytes(signal: Dict) -> bytes:
+    """
+    Encode a signal dictionary as compact UTF-8 JSON.
+    
+    Uses orjson when installed; NumPy values and timestamps are encoded
+    as-is either way, without converting the dictionary first.
+    
+    Args:
+        signal: Signal dictionary (see SignalGenerator.generate_signal)
+        
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(signal, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(signal, default=_json_default, separators=(',', ':'), ensure_ascii=False).encode()
+
 
 class SignalGenerator:
     """
     Real-time signal generator combining indicators and ML models.
+    
+    Generators share the process-wide scanner and Binance client (see
+    get_scanner) and may be used from several threads.
     """
     
     def __init__(self, use_ml: bool = True):
@@ -30,24 +91,48 @@ class SignalGenerator:
         Args:
             use_ml: Whether to use ML model for predictions
         """
+        from scanner.market_scanner import get_scanner
+        from ml_models.feature_engineering import FeatureEngineering
+        
         self.config = get_config()
-        self.client = BinanceClient()
-        self.scanner = MarketScanner()
+        
+        # Process-wide scanner and its Binance client, so generators share
+        # connections, the request weight budget and recent scans
+        self.scanner = get_scanner()
+        self.client = self.scanner.client
         self.use_ml = use_ml
         
         # Load ML model if available
         self.ml_model = None
         if use_ml:
             try:
+                from ml_models.money_flow_classifier import MoneyFlowClassifier
                 self.ml_model = MoneyFlowClassifier()
                 self.ml_model.load('models/money_flow_classifier.pkl')
+                
+                # Signals are predicted a row or a small batch at a time, where
+                # fanning trees out to a thread pool per call costs more than
+                # it saves and competes with the scanner's own workers
+                if 'n_jobs' in self.ml_model.model.get_params():
+                    self.ml_model.model.set_params(n_jobs=1)
                 logger.info("✅ ML model loaded")
             except Exception as e:
-                logger.warning(f"Could not load ML model: {e}")
+                logger.warning("Could not load ML model: %s", e)
                 self.use_ml = False
         
         self.fe = FeatureEngineering()
         
+        # Indicator scores inside +/- this band are final without the model
+        self.ml_skip_band = self.config.get_scanner_params().get('ml_skip_band', 0.5)
+        
+        # scikit-learn does not document predict as thread-safe
+        self._ml_lock = threading.Lock()
+        
+        # Latest ML prediction per (symbol, timeframe, limit), valid while
+        # the latest candle is unchanged
+        self._prediction_cache = OrderedDict()
+        self._prediction_cache_lock = threading.Lock()
+        
         logger.info("✅ Signal Generator initialized")
     
     def generate_signal(
@@ -68,108 +153,275 @@ class SignalGenerator:
             Dictionary with signal information
         """
         try:
-            # Scan symbol with all indicators
-            df = self.scanner.scan_symbol(symbol, timeframe, limit)
+            analyzed = self._analyze(symbol, timeframe, limit)
             
-            if df.empty:
+            if analyzed is None:
                 return {'error': f'No data for {symbol}'}
             
-            # Get latest indicator signals
-            latest = df.iloc[-1]
-            signals = self.scanner.get_latest_signals(df, symbol)
+            signals, X_latest, prediction = analyzed
             
             # Add ML prediction if available
-            ml_signal = None
-            ml_probability = None
+            ml_signal, ml_probability = prediction or (None, None)
+            
+            if X_latest is not None:
+                try:
+                    ml_signals, ml_probabilities = self._predict(X_latest)
+                    ml_signal = int(ml_signals[0])
+                    ml_probability = float(ml_probabilities[0])
+                    self._store_prediction(symbol, timeframe, limit, signals, (ml_signal, ml_probability))
+                except Exception as e:
+                    logger.warning("ML prediction failed for %s: %s", symbol, e)
+            
+            return self._build_signal(symbol, timeframe, signals, ml_signal, ml_probability)
+            
+        except Exception as e:
+            logger.error("Error generating signal for %s: %s", symbol, e)
+            return {'error': str(e)}
+    
+    def generate_signal_bytes(
+        self,
+        symbol: str,
+        timeframe: str = '1h',
+        limit: int = 200
+    ) -> bytes:
+        """
+        Generate a signal for a symbol, encoded as JSON for the dashboard/API.
+        
+        Args:
+            symbol: Trading pair (e.g., 'BTC/USDT')
+            timeframe: Timeframe
+            limit: Number of candles to fetch
+            
+        Returns:
+            Signal dictionary (see generate_signal) as JSON bytes
+        """
+        return signal_to_bytes(self.generate_signal(symbol, timeframe, limit))
+    
+    def _analyze(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        df: Optional['pd.DataFrame'] = None
+    ) -> Optional[Tuple[Dict, Optional[np.ndarray], Optional[Tuple[int, float]]]]:
+        """
+        Scan a symbol and collect the inputs of its signal.
+        
+        Args:
+            symbol: Trading pair (e.g., 'BTC/USDT')
+            timeframe: Timeframe
+            limit: Number of candles to fetch
+            df: Scan of the symbol if already taken (scanned here if None)
+            
+        Returns:
+            Tuple of (latest indicator signals, latest feature row for the
+            ML model, cached ML prediction), or None if there is no data.
+            At most one of the last two is set: the feature row is None when
+            the ML model is not used, the score is within ml_skip_band, the
+            prediction is cached or feature engineering failed.
+        """
+        # Scan symbol with all indicators
+        if df is None:
+            df = self.scanner.scan_symbol(symbol, timeframe, limit)
+        
+        if df.empty:
+            return None
+        
+        # Get latest indicator signals
+        signals = self.scanner.get_latest_signals(df, symbol)
+        
+        X_latest = None
+        prediction = None
+        
+        # Neutral scores the ML boost cannot change skip feature engineering,
+        # as do candles the model has already seen
+        if self.use_ml and self.ml_model and abs(signals['signal_score']) >= self.ml_skip_band:
+            prediction = self._get_cached_prediction(symbol, timeframe, limit, signals)
             
-            if self.use_ml and self.ml_model:
+            if prediction is None:
                 try:
                     # Engineer features for ML
                     df_features = self.fe.engineer_all_features(df, include_indicators=False)
                     
-                    # Get latest features
-                    X_latest = df_features[self.fe.feature_columns].iloc[-1:].fillna(0)
-                    
-                    # Predict
-                    ml_signal = int(self.ml_model.predict(X_latest)[0])
-                    ml_probability = float(self.ml_model.predict_proba(X_latest)[0])
+                    # Latest features as a (1, n_features) array, NaN as 0; the
+                    # row is converted once rather than through a column subset
+                    columns = df_features.columns.get_indexer(self.fe.feature_columns)
+                    if (columns < 0).any():
+                        missing = [col for col, i in zip(self.fe.feature_columns, columns) if i < 0]
+                        raise KeyError(f"Missing feature columns: {missing}")
+                    X_latest = df_features.iloc[-1:].to_numpy(dtype=np.float32)[:, columns]
+                    np.nan_to_num(X_latest, copy=False)
                     
                 except Exception as e:
-                    logger.warning(f"ML prediction failed for {symbol}: {e}")
+                    logger.warning("ML prediction failed for %s: %s", symbol, e)
+        
+        return signals, X_latest, prediction
+    
+    @staticmethod
+    def _latest_candle(signals: Dict) -> Tuple:
+        """
+        Identify the latest candle behind a set of signals.
+        
+        The candle still forming keeps its timestamp while trading goes on,
+        so its close and volume are part of the identity.
+        
+        Args:
+            signals: Latest indicator signals
             
-            # Calculate final signal
-            final_score = signals['signal_score']
+        Returns:
+            Tuple of (timestamp, close, volume)
+        """
+        return signals['timestamp'], signals['price'], signals['volume']
+    
+    def _get_cached_prediction(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        signals: Dict
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Look up the ML prediction made for the same latest candle.
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe
+            limit: Number of candles
+            signals: Latest indicator signals
             
-            if ml_signal == 1 and ml_probability > 0.6:
-                final_score += 1.0  # Boost score with ML confirmation
+        Returns:
+            Tuple of (ml_signal, ml_probability), or None if not cached
+        """
+        key = (symbol, timeframe, limit)
+        with self._prediction_cache_lock:
+            entry = self._prediction_cache.get(key)
+            if entry is None or entry[0] != self._latest_candle(signals):
+                return None
             
-            # Determine final signal type
-            if final_score >= 3:
-                final_signal = "STRONG BUY"
-            elif final_score >= 1.5:
-                final_signal = "BUY"
-            elif final_score <= -3:
-                final_signal = "STRONG SELL"
-            elif final_score <= -1.5:
-                final_signal = "SELL"
-            else:
-                final_signal = "NEUTRAL"
+            self._prediction_cache.move_to_end(key)
+            return entry[1]
+    
+    def _store_prediction(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        signals: Dict,
+        prediction: Tuple[int, float]
+    ):
+        """
+        Remember an ML prediction until the latest candle changes.
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe
+            limit: Number of candles
+            signals: Latest indicator signals the prediction was made for
+            prediction: Tuple of (ml_signal, ml_probability)
+        """
+        key = (symbol, timeframe, limit)
+        with self._prediction_cache_lock:
+            self._prediction_cache[key] = (self._latest_candle(signals), prediction)
+            self._prediction_cache.move_to_end(key)
+            while len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+                self._prediction_cache.popitem(last=False)
+    
+    def _predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the ML model on one or more feature rows.
+        
+        Args:
+            X: Feature rows in feature_columns order
             
-            # Build signal dictionary
-            signal_data = {
-                'symbol': symbol,
-                'timestamp': datetime.now(),
-                'price': signals['price'],
-                'timeframe': timeframe,
-                
-                # Indicator signals
-                'indicator_score': signals['signal_score'],
-                'indicator_signal': signals['signal_type'],
-                
-                # Individual indicators
-                'wavetrend': {
-                    'wt1': signals['wt1'],
-                    'wt2': signals['wt2'],
-                    'buy_signal': bool(signals['wt_buy']),
-                    'sell_signal': bool(signals['wt_sell'])
-                },
-                'mfi': {
-                    'value': signals['mfi'],
-                    'oversold': signals['mfi'] < 20,
-                    'overbought': signals['mfi'] > 80
-                },
-                'rsi': {
-                    'value': signals['rsi'],
-                    'oversold': signals['rsi'] < 30,
-                    'overbought': signals['rsi'] > 70
-                },
-                'stoch_rsi': {
-                    'k': signals['stoch_k'],
-                    'd': signals['stoch_d'],
-                    'oversold': signals['stoch_k'] < 20,
-                    'overbought': signals['stoch_k'] > 80
-                },
-                
-                # ML prediction
-                'ml_prediction': {
-                    'signal': ml_signal,
-                    'probability': ml_probability,
-                    'enabled': self.use_ml
-                } if self.use_ml else None,
-                
-                # Final signal
-                'final_score': final_score,
-                'final_signal': final_signal,
-                'confidence': self._calculate_confidence(signals, ml_signal, ml_probability)
-            }
+        Returns:
+            Tuple of (predicted classes, probabilities of class 1)
+        """
+        with self._ml_lock:
+            return self.ml_model.predict(X), self.ml_model.predict_proba(X)
+    
+    def _build_signal(
+        self,
+        symbol: str,
+        timeframe: str,
+        signals: Dict,
+        ml_signal: Optional[int],
+        ml_probability: Optional[float]
+    ) -> Dict:
+        """
+        Combine indicator signals and the ML prediction into a final signal.
+        
+        Args:
+            symbol: Trading pair (e.g., 'BTC/USDT')
+            timeframe: Timeframe
+            signals: Latest indicator signals (see MarketScanner.get_latest_signals)
+            ml_signal: ML prediction (None if unavailable)
+            ml_probability: ML probability (None if unavailable)
             
-            logger.info(f"✅ Signal generated for {symbol}: {final_signal} (score: {final_score:.1f})")
+        Returns:
+            Dictionary with signal information
+        """
+        from scanner.market_scanner import classify_scores
+        
+        # Calculate final signal
+        final_score = signals['signal_score']
+        
+        if ml_signal == 1 and ml_probability > 0.6:
+            final_score += 1.0  # Boost score with ML confirmation
+        
+        # Determine final signal type (same bands as scan_all_symbols)
+        final_signal = str(classify_scores(np.float64(final_score)))
+        
+        # Build signal dictionary
+        signal_data = {
+            'symbol': symbol,
+            'timestamp': datetime.now(),
+            'price': signals['price'],
+            'timeframe': timeframe,
             
-            return signal_data
+            # Indicator signals
+            'indicator_score': signals['signal_score'],
+            'indicator_signal': signals['signal_type'],
             
-        except Exception as e:
-            logger.error(f"Error generating signal for {symbol}: {e}")
-            return {'error': str(e)}
+            # Individual indicators
+            'wavetrend': {
+                'wt1': signals['wt1'],
+                'wt2': signals['wt2'],
+                'buy_signal': bool(signals['wt_buy']),
+                'sell_signal': bool(signals['wt_sell'])
+            },
+            'mfi': {
+                'value': signals['mfi'],
+                'oversold': signals['mfi'] < 20,
+                'overbought': signals['mfi'] > 80
+            },
+            'rsi': {
+                'value': signals['rsi'],
+                'oversold': signals['rsi'] < 30,
+                'overbought': signals['rsi'] > 70
+            },
+            'stoch_rsi': {
+                'k': signals['stoch_k'],
+                'd': signals['stoch_d'],
+                'oversold': signals['stoch_k'] < 20,
+                'overbought': signals['stoch_k'] > 80
+            },
+            
+            # ML prediction
+            'ml_prediction': {
+                'signal': ml_signal,
+                'probability': ml_probability,
+                'enabled': self.use_ml
+            } if self.use_ml else None,
+            
+            # Final signal
+            'final_score': final_score,
+            'final_signal': final_signal,
+            'confidence': self._calculate_confidence(signals, ml_signal, ml_probability)
+        }
+        
+        logger.info("✅ Signal generated for %s: %s (score: %.1f)", symbol, final_signal, final_score)
+        
+        return signal_data
     
     def _calculate_confidence(
         self,
@@ -190,20 +442,16 @@ class SignalGenerator:
         """
         confidence = 0.5  # Base confidence
         
+        # As Python floats, comparisons give bools that add up as integers
+        # (NumPy bools would OR together instead)
+        wt1 = float(signals['wt1'])
+        mfi = float(signals['mfi'])
+        rsi = float(signals['rsi'])
+        stoch_k = float(signals['stoch_k'])
+        
         # Boost confidence if multiple indicators agree
-        oversold_count = sum([
-            signals['wt1'] < -60,
-            signals['mfi'] < 20,
-            signals['rsi'] < 30,
-            signals['stoch_k'] < 20
-        ])
-        
-        overbought_count = sum([
-            signals['wt1'] > 60,
-            signals['mfi'] > 80,
-            signals['rsi'] > 70,
-            signals['stoch_k'] > 80
-        ])
+        oversold_count = (wt1 < -60) + (mfi < 20) + (rsi < 30) + (stoch_k < 20)
+        overbought_count = (wt1 > 60) + (mfi > 80) + (rsi > 70) + (stoch_k > 80)
         
         # More agreeing indicators = higher confidence
         max_agreement = max(oversold_count, overbought_count)
@@ -218,56 +466,126 @@ class SignalGenerator:
         
         return min(confidence, 1.0)
     
+    @staticmethod
+    def _confidence_many(indicators: np.ndarray, ml_probabilities: np.ndarray) -> np.ndarray:
+        """
+        Calculate signal confidence for several symbols at once.
+        
+        Same rules as _calculate_confidence.
+        
+        Args:
+            indicators: Array of shape (n_symbols, 4) with the values of
+                AGREEMENT_INDICATORS
+            ml_probabilities: ML probabilities (NaN where unavailable)
+            
+        Returns:
+            Array of confidence scores (0-1)
+        """
+        # More agreeing indicators = higher confidence
+        max_agreement = np.maximum(
+            (indicators < OVERSOLD_LEVELS).sum(axis=1),
+            (indicators > OVERBOUGHT_LEVELS).sum(axis=1)
+        )
+        confidence = 0.5 + (max_agreement / 4) * 0.3
+        
+        # ML confirmation adds confidence
+        confidence += np.select([ml_probabilities > 0.7, ml_probabilities > 0.5], [0.2, 0.1], 0.0)
+        
+        return np.minimum(confidence, 1.0)
+    
     def scan_all_symbols(
         self,
         symbols: Optional[List[str]] = None,
-        timeframe: str = '1h'
-    ) -> pd.DataFrame:
+        timeframe: str = '1h',
+        limit: int = 200
+    ) -> 'pd.DataFrame':
         """
         Generate signals for multiple symbols.
         
+        Candles for all symbols are fetched in one batch of concurrent
+        requests before any signal is built (see MarketScanner.scan_symbols).
+        The ML model then scores all symbols in a single batch.
+        
         Args:
             symbols: List of symbols (uses config default if None)
             timeframe: Timeframe to analyze
+            limit: Number of candles per symbol
             
         Returns:
-            DataFrame with signals for all symbols
+            DataFrame with signals for all symbols; final_signal is an
+            ordered categorical over the scanner's SIGNAL_TYPES
         """
+        import pandas as pd
+        from scanner.market_scanner import SIGNAL_TYPES, score_bands
+        
         if symbols is None:
             symbols = get_top_symbols()
         
-        logger.info(f"🔍 Generating signals for {len(symbols)} symbols...")
+        logger.info("🔍 Generating signals for %d symbols...", len(symbols))
         
-        results = []
+        # Symbols that fail are isolated (and left empty) by scan_symbols
+        try:
+            scans = self.scanner.scan_symbols(symbols, timeframe, limit)
+        except Exception as e:
+            logger.error("Error scanning symbols: %s", e)
+            return pd.DataFrame()
         
-        for symbol in symbols:
-            signal = self.generate_signal(symbol, timeframe)
-            
-            if 'error' not in signal:
-                results.append(signal)
-        
-        if results:
-            # Convert to DataFrame
-            df_results = pd.DataFrame([{
-                'symbol': s['symbol'],
-                'price': s['price'],
-                'final_signal': s['final_signal'],
-                'final_score': s['final_score'],
-                'confidence': s['confidence'],
-                'wt1': s['wavetrend']['wt1'],
-                'mfi': s['mfi']['value'],
-                'rsi': s['rsi']['value'],
-                'ml_prob': s['ml_prediction']['probability'] if s['ml_prediction'] else None
-            } for s in results])
-            
-            df_results = df_results.sort_values('final_score', ascending=False)
-            
-            logger.info(f"✅ Signals generated for {len(results)} symbols")
-            
-            return df_results
-        else:
+        def analyze(symbol: str) -> Optional[Tuple[Dict, Optional[np.ndarray], Optional[Tuple[int, float]]]]:
+            try:
+                return self._analyze(symbol, timeframe, limit, scans[symbol])
+            except Exception as e:
+                logger.error("Error generating signal for %s: %s", symbol, e)
+                return None
+        
+        analyzed = [analyze(symbol) for symbol in symbols]
+        
+        scanned = [(symbol, *result) for symbol, result in zip(symbols, analyzed) if result is not None]
+        
+        # One model call for every symbol with features
+        predictions = [prediction for _, _, _, prediction in scanned]
+        batch = [i for i, (_, _, X_latest, _) in enumerate(scanned) if X_latest is not None]
+        
+        if batch:
+            try:
+                predicted, probabilities = self._predict(np.vstack([scanned[i][2] for i in batch]))
+                for i, ml_signal, ml_probability in zip(batch, predicted, probabilities):
+                    symbol, signals = scanned[i][:2]
+                    predictions[i] = (int(ml_signal), float(ml_probability))
+                    self._store_prediction(symbol, timeframe, limit, signals, predictions[i])
+            except Exception as e:
+                logger.warning("ML prediction failed for %d symbols: %s", len(batch), e)
+        
+        if not scanned:
             logger.warning("No signals generated")
             return pd.DataFrame()
+        
+        # Final scores, signal types and confidence for all symbols at once
+        # (as in _build_signal, which only generate_signal needs)
+        latest = [signals for _, signals, _, _ in scanned]
+        indicators = np.array([[signals[col] for col in AGREEMENT_INDICATORS] for signals in latest], dtype=np.float64)
+        ml_signals = np.array([prediction[0] if prediction else -1 for prediction in predictions])
+        ml_probabilities = np.array([prediction[1] if prediction else np.nan for prediction in predictions])
+        
+        final_scores = np.array([signals['signal_score'] for signals in latest], dtype=np.float64)
+        final_scores += np.where((ml_signals == 1) & (ml_probabilities > 0.6), 1.0, 0.0)
+        
+        df_results = pd.DataFrame({
+            'symbol': [symbol for symbol, _, _, _ in scanned],
+            'price': [signals['price'] for signals in latest],
+            'final_signal': pd.Categorical.from_codes(score_bands(final_scores), categories=SIGNAL_TYPES, ordered=True),
+            'final_score': final_scores,
+            'confidence': self._confidence_many(indicators, ml_probabilities),
+            'wt1': [signals['wt1'] for signals in latest],
+            'mfi': [signals['mfi'] for signals in latest],
+            'rsi': [signals['rsi'] for signals in latest],
+            'ml_prob': [prediction[1] if prediction else None for prediction in predictions]
+        })
+        
+        df_results = df_results.sort_values('final_score', ascending=False, kind='stable')
+        
+        logger.info("✅ Signals generated for %d symbols", len(df_results))
+        
+        return df_results
 
 
 if __name__ == '__main__':
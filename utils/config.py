@@ -6,14 +6,87 @@ and environment variables.
 """
 
 import os
+import numpy as np
 import yaml
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Storage dtype of indicator inputs and outputs (RSI, StochRSI, WaveTrend).
+# Kernels accumulate in float64 either way; set to np.float64 to store
+# full precision as well.
+INDICATOR_DTYPE = np.float32
+
+# Storage dtype of engineered ML features (flag columns stay int8). Feature
+# math runs in float64; results are narrowed once at the end.
+FEATURE_DTYPE = np.float32
+
+# libyaml-backed loader when PyYAML was built with it (several times faster
+# than the pure-Python one); both produce the same data
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed YAML files shared by all Config instances, keyed by resolved path
+# and stored with the modification time they were read at
+_yaml_cache: Dict[Path, Tuple[int, Any]] = {}
+
+# Returned for config sections that are missing
+EMPTY_SECTION: Mapping[str, Any] = MappingProxyType({})
+
+
+def _load_yaml(path: Path) -> Any:
+    """
+    Parse a YAML file, reusing the last parse while the file is unchanged.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        Parsed content
+    """
+    path = Path(path).resolve()
+    mtime = path.stat().st_mtime_ns
+    
+    cached = _yaml_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=YAML_LOADER)
+    _yaml_cache[path] = (mtime, data)
+    return data
+
+
+def _flatten(section: Dict[str, Any], prefix: str, flat: Dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Index a nested config section by dotted key.
+    
+    Every value is stored under its dotted path (e.g.
+    'indicators.wave_trend.channel_length'); nested sections are stored
+    the same way as read-only views, so they can be handed to any caller
+    or thread without copying.
+    
+    Args:
+        section: Parsed config section
+        prefix: Dotted path of the section including the trailing dot
+            ('' for the root)
+        flat: Index to fill
+        
+    Returns:
+        Read-only view of the section
+    """
+    frozen = {}
+    for key, value in section.items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict):
+            value = _flatten(value, f"{dotted}.", flat)
+        flat[dotted] = value
+        frozen[key] = value
+    return MappingProxyType(frozen)
+
 
 class Config:
     """Configuration manager for SignalCipher."""
@@ -27,9 +100,27 @@ class Config:
         """
         self.config_dir = Path(config_dir)
         self._config = None
+        self._flat = None
         self._symbols = None
         self._timeframes = None
         
+        # Enabled symbols and timeframes, built on first use
+        self._top_symbols: Optional[Tuple[str, ...]] = None
+        self._active_timeframes: Optional[Tuple[str, ...]] = None
+        
+    def reload(self):
+        """
+        Forget loaded configuration so the next access reads it again.
+        
+        Files are only parsed again if they changed on disk (see _load_yaml).
+        """
+        self._config = None
+        self._flat = None
+        self._symbols = None
+        self._timeframes = None
+        self._top_symbols = None
+        self._active_timeframes = None
+    
     def load_config(self) -> Dict[str, Any]:
         """
         Load main configuration file.
@@ -39,10 +130,28 @@ class Config:
         """
         if self._config is None:
             config_path = self.config_dir / "config.yaml"
-            with open(config_path, 'r') as f:
-                self._config = yaml.safe_load(f)
+            self._config = _load_yaml(config_path)
+            self._flat = {}
+            _flatten(self._config or {}, '', self._flat)
         return self._config
     
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Look up a value of the main configuration by dotted key.
+        
+        Sections come back as read-only mappings.
+        
+        Args:
+            key: Dotted path (e.g., 'indicators.wave_trend.channel_length')
+            default: Value returned if the key is not set
+            
+        Returns:
+            Configured value or default
+        """
+        if self._flat is None:
+            self.load_config()
+        return self._flat.get(key, default)
+    
     def load_symbols(self) -> Dict[str, Any]:
         """
         Load symbols configuration.
@@ -52,8 +161,7 @@ class Config:
         """
         if self._symbols is None:
             symbols_path = self.config_dir / "symbols.yaml"
-            with open(symbols_path, 'r') as f:
-                self._symbols = yaml.safe_load(f)
+            self._symbols = _load_yaml(symbols_path)
         return self._symbols
     
     def load_timeframes(self) -> Dict[str, Any]:
@@ -65,44 +173,50 @@ class Config:
         """
         if self._timeframes is None:
             timeframes_path = self.config_dir / "timeframes.yaml"
-            with open(timeframes_path, 'r') as f:
-                self._timeframes = yaml.safe_load(f)
+            self._timeframes = _load_yaml(timeframes_path)
         return self._timeframes
     
-    def get_top_symbols(self, count: Optional[int] = None) -> List[str]:
+    def get_top_symbols(self, count: Optional[int] = None) -> Tuple[str, ...]:
         """
-        Get list of top cryptocurrency symbols to scan.
+        Get the top cryptocurrency symbols to scan.
+        
+        The tuple is built once and shared until reload().
         
         Args:
             count: Number of symbols to return (None for all enabled)
             
         Returns:
-            List of symbol strings (e.g., ['BTC/USDT', 'ETH/USDT'])
+            Tuple of symbol strings (e.g., ('BTC/USDT', 'ETH/USDT'))
         """
-        symbols_config = self.load_symbols()
-        top_symbols = [
-            s['symbol'] 
-            for s in symbols_config['top_10'] 
-            if s.get('enabled', True)
-        ]
+        if self._top_symbols is None:
+            symbols_config = self.load_symbols()
+            self._top_symbols = tuple(
+                s['symbol'] 
+                for s in symbols_config['top_10'] 
+                if s.get('enabled', True)
+            )
         
         if count:
-            return top_symbols[:count]
-        return top_symbols
+            return self._top_symbols[:count]
+        return self._top_symbols
     
-    def get_active_timeframes(self) -> List[str]:
+    def get_active_timeframes(self) -> Tuple[str, ...]:
         """
-        Get list of active timeframes.
+        Get the active timeframes.
+        
+        The tuple is built once and shared until reload().
         
         Returns:
-            List of timeframe codes (e.g., ['1h', '4h', '1d'])
-        """
-        timeframes_config = self.load_timeframes()
-        return [
-            tf['code'] 
-            for tf in timeframes_config['timeframes'] 
-            if tf.get('enabled', False)
-        ]
+            Tuple of timeframe codes (e.g., ('1h', '4h', '1d'))
+        """
+        if self._active_timeframes is None:
+            timeframes_config = self.load_timeframes()
+            self._active_timeframes = tuple(
+                tf['code'] 
+                for tf in timeframes_config['timeframes'] 
+                if tf.get('enabled', False)
+            )
+        return self._active_timeframes
     
     def get_api_keys(self) -> Dict[str, str]:
         """
@@ -128,7 +242,7 @@ class Config:
             'secret': secret
         }
     
-    def get_indicator_params(self, indicator_name: str) -> Dict[str, Any]:
+    def get_indicator_params(self, indicator_name: str) -> Mapping[str, Any]:
         """
         Get parameters for a specific indicator.
         
@@ -136,13 +250,11 @@ class Config:
             indicator_name: Name of the indicator (e.g., 'money_flow', 'wave_trend')
             
         Returns:
-            Dictionary of indicator parameters
+            Read-only mapping of indicator parameters
         """
-        config = self.load_config()
-        indicators = config.get('indicators', {})
-        return indicators.get(indicator_name, {})
+        return self.get(f'indicators.{indicator_name}', EMPTY_SECTION)
     
-    def get_ml_params(self, model_name: str) -> Dict[str, Any]:
+    def get_ml_params(self, model_name: str) -> Mapping[str, Any]:
         """
         Get parameters for a specific ML model.
         
@@ -150,21 +262,36 @@ class Config:
             model_name: Name of the model
             
         Returns:
-            Dictionary of model parameters
+            Read-only mapping of model parameters
         """
-        config = self.load_config()
-        ml_models = config.get('ml_models', {})
-        return ml_models.get(model_name, {})
+        return self.get(f'ml_models.{model_name}', EMPTY_SECTION)
     
-    def get_scanner_params(self) -> Dict[str, Any]:
+    def get_scanner_params(self) -> Mapping[str, Any]:
         """
         Get scanner configuration parameters.
         
         Returns:
-            Dictionary of scanner parameters
+            Read-only mapping of scanner parameters
+        """
+        return self.get('scanner', EMPTY_SECTION)
+    
+    def get_data_collection_params(self) -> Mapping[str, Any]:
+        """
+        Get data collection parameters (rate limits, retries, storage).
+        
+        Returns:
+            Read-only mapping of data collection parameters
+        """
+        return self.get('data_collection', EMPTY_SECTION)
+    
+    def get_performance_params(self) -> Mapping[str, Any]:
+        """
+        Get performance parameters (caching, parallelism, batch sizes).
+        
+        Returns:
+            Read-only mapping of performance parameters
         """
-        config = self.load_config()
-        return config.get('scanner', {})
+        return self.get('performance', EMPTY_SECTION)
     
     def get_database_url(self) -> str:
         """
@@ -200,12 +327,12 @@ def get_config() -> Config:
     return config
 
 
-def get_top_symbols(count: Optional[int] = None) -> List[str]:
+def get_top_symbols(count: Optional[int] = None) -> Tuple[str, ...]:
     """Get list of top symbols to scan."""
     return config.get_top_symbols(count)
 
 
-def get_active_timeframes() -> List[str]:
+def get_active_timeframes() -> Tuple[str, ...]:
     """Get list of active timeframes."""
     return config.get_active_timeframes()
 
@@ -215,12 +342,12 @@ def get_api_keys() -> Dict[str, str]:
     return config.get_api_keys()
 
 
-def get_indicator_params(indicator_name: str) -> Dict[str, Any]:
+def get_indicator_params(indicator_name: str) -> Mapping[str, Any]:
     """Get parameters for an indicator."""
     return config.get_indicator_params(indicator_name)
 
 
-def get_ml_params(model_name: str) -> Dict[str, Any]:
+def get_ml_params(model_name: str) -> Mapping[str, Any]:
     """Get parameters for an ML model."""
     return config.get_ml_params(model_name)
 
@@ -5,13 +5,25 @@ Provides centralized logging with console and file handlers,
 including rotation and different log levels.
 """
 
+import atexit
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
 import os
 
+# Background listeners writing out the records of each configured logger,
+# keyed by logger name
+_listeners: Dict[str, QueueListener] = {}
+
+# None of the formats print thread or process details, so records skip
+# looking them up
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with colors for console output."""
@@ -26,14 +38,31 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'        # Reset
     }
     
+    def __init__(self, *args, use_colors: bool = True, **kwargs):
+        """
+        Initialize formatter.
+        
+        Args:
+            *args: Positional arguments for logging.Formatter
+            use_colors: Whether to color level names (off when not on a terminal)
+            **kwargs: Keyword arguments for logging.Formatter
+        """
+        super().__init__(*args, **kwargs)
+        self.use_colors = use_colors
+    
     def format(self, record):
         """Format log record with colors."""
-        if record.levelname in self.COLORS:
-            record.levelname = (
-                f"{self.COLORS[record.levelname]}{record.levelname}"
-                f"{self.COLORS['RESET']}"
-            )
-        return super().format(record)
+        if not self.use_colors or record.levelname not in self.COLORS:
+            return super().format(record)
+        
+        # The record is shared with the file handlers, so color it only for
+        # the duration of this call
+        levelname = record.levelname
+        record.levelname = f"{self.COLORS[levelname]}{levelname}{self.COLORS['RESET']}"
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
 
 
 def setup_logger(
@@ -64,20 +93,25 @@ def setup_logger(
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, log_level.upper()))
     
-    # Remove existing handlers
+    # Remove existing handlers (and the listener feeding them)
+    _stop_listener(name)
     logger.handlers.clear()
+    handlers = []
     
     # Console handler
     if console:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         
-        console_format = ColoredFormatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        # Colors only on a terminal and never with NO_COLOR set (no-color.org);
+        # otherwise a plain formatter leaves level names untouched
+        console_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        if sys.stdout.isatty() and not os.getenv('NO_COLOR'):
+            console_format = ColoredFormatter(console_fmt, datefmt='%Y-%m-%d %H:%M:%S')
+        else:
+            console_format = logging.Formatter(console_fmt, datefmt='%Y-%m-%d %H:%M:%S')
         console_handler.setFormatter(console_format)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # File handler
     if file_logging:
@@ -98,7 +132,7 @@ def setup_logger(
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
         
         # Error log file (ERROR and CRITICAL only)
         error_handler = RotatingFileHandler(
@@ -108,11 +142,54 @@ def setup_logger(
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(file_format)
-        logger.addHandler(error_handler)
+        handlers.append(error_handler)
+    
+    # The handlers run on a background thread; logging calls only put the
+    # record on a queue, so callers never wait on console or file I/O
+    if handlers:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        logger.addHandler(QueueHandler(log_queue))
     
     return logger
 
 
+def _stop_listener(name: str):
+    """
+    Stop the listener of a logger, writing out any queued records.
+    
+    Args:
+        name: Logger name
+    """
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+
+def _stop_listeners():
+    """Stop all listeners, writing out any queued records."""
+    for name in list(_listeners):
+        _stop_listener(name)
+
+
+def _log_directly_after_fork():
+    """
+    Attach the handlers straight to their loggers in a forked child.
+    
+    The listener threads do not survive a fork, so records queued in the
+    child would never be written.
+    """
+    for name, listener in _listeners.items():
+        logging.getLogger(name).handlers = list(listener.handlers)
+    _listeners.clear()
+
+
+atexit.register(_stop_listeners)
+os.register_at_fork(after_in_child=_log_directly_after_fork)
+
+
 # Global logger instance
 logger = setup_logger()
 